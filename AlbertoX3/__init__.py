@@ -10,17 +10,176 @@ from vendor.AlbertUnruhUtils.utils.logger import get_logger
 __root_logger__ = get_logger(None, level=0)
 
 
-from .aio import *
-from .colors import *
-from .constants import *
-from .contributors import *
-from .database import *
-from .enum import *
-from .environment import *
-from .errors import *
-from .ipy_wrapper import *
-from .misc import *
-from .permission import *
-from .settings import *
-from .translations import *
-from .utils import *
+from importlib import import_module
+from typing import Any
+
+
+# the submodules are only imported if one of their attributes is accessed
+# (e.g. ``AlbertoX3.errors`` won't build the database engine or read the ``.env`` file)
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    # .aio
+    "event_loop": "aio",
+    "Thread": "aio",
+    "ThreadPool": "aio",
+    "thread_pool": "aio",
+    "LockDeco": "aio",
+    "KeyLockDeco": "aio",
+    "SingleFlightDeco": "aio",
+    "gather_any": "aio",
+    "run_in_thread": "aio",
+    "semaphore_gather": "aio",
+    "semaphore_map": "aio",
+    "run_as_task": "aio",
+    # .cache
+    "LocalCache": "cache",
+    "CacheInvalidator": "cache",
+    "local_cache": "cache",
+    "language_cache": "cache",
+    "invalidator": "cache",
+    "warm_up_cache": "cache",
+    # .colors
+    "AllColors": "colors",
+    "FlatUIColors": "colors",
+    "MaterialColors": "colors",
+    # .constants
+    "LIB_PATH": "constants",
+    "MISSING": "constants",
+    "Config": "constants",
+    "StyleConfig": "constants",
+    # .contributors
+    "Contributor": "contributors",
+    # .database
+    "select": "database",
+    "filter_by": "database",
+    "exists": "database",
+    "delete": "database",
+    "Base": "database",
+    "UTCDatetime": "database",
+    "SessionScope": "database",
+    "DB": "database",
+    "db_context": "database",
+    "db_wrapper": "database",
+    "db_invocation_wrapper": "database",
+    "get_database": "database",
+    "db": "database",
+    "redis": "database",
+    # .enum
+    "NoAliasEnum": "enum",
+    # .environment
+    "TOKEN": "environment",
+    "OWNER_ID": "environment",
+    "LOG_LEVEL": "environment",
+    "VERSION_OVERRIDE": "environment",
+    "VERSION_STAMP": "environment",
+    "THREAD_POOL_SIZE": "environment",
+    "STARTUP_PROFILE": "environment",
+    "EXTENSIONS_MANIFEST": "environment",
+    "TRANSLATIONS_CACHE": "environment",
+    "TRANSLATIONS_WATCH": "environment",
+    "DB_DRIVER": "environment",
+    "DB_HOST": "environment",
+    "DB_PORT": "environment",
+    "DB_DATABASE": "environment",
+    "DB_USERNAME": "environment",
+    "DB_PASSWORD": "environment",
+    "DB_POOL_RECYCLE": "environment",
+    "DB_POOL_SIZE": "environment",
+    "DB_POOL_MAX_OVERFLOW": "environment",
+    "DB_SHOW_SQL_STATEMENTS": "environment",
+    "CACHE_TTL": "environment",
+    "CACHE_LOCAL_TTL": "environment",
+    "CACHE_LOCAL_SIZE": "environment",
+    "CACHE_LANGUAGE_SIZE": "environment",
+    "CACHE_INVALIDATION_CHANNEL": "environment",
+    "CACHE_WARMUP": "environment",
+    "CACHE_WARMUP_BATCH_SIZE": "environment",
+    "CACHE_WARMUP_TIMEOUT": "environment",
+    "REDIS_HOST": "environment",
+    "REDIS_PORT": "environment",
+    "REDIS_DB": "environment",
+    "REDIS_PASSWORD": "environment",
+    # .errors
+    "AlbertoX3Error": "errors",
+    "DeveloperError": "errors",
+    "DeveloperArgumentError": "errors",
+    "UnrecognisedPermissionLevelError": "errors",
+    "InvalidPermissionLevelError": "errors",
+    "GatherAnyError": "errors",
+    "TaskCancelledError": "errors",
+    "UnrecognisedBooleanError": "errors",
+    "TranslationError": "errors",
+    "UnsupportedTranslationTypeError": "errors",
+    "UnsupportedLanguageError": "errors",
+    "DatabaseError": "errors",
+    "NoActiveSessionError": "errors",
+    "ExtensionError": "errors",
+    "ExtensionLoadingError": "errors",
+    "NoExtensionError": "errors",
+    "TooMayExtensionsError": "errors",
+    "ExtensionNotLoadedError": "errors",
+    # .ipy_wrapper
+    "Extension": "ipy_wrapper",
+    # .misc
+    "FormatStr": "misc",
+    "EXTENSION_FEATURES": "misc",
+    "PrimitiveExtension": "misc",
+    "SubclassRegistry": "misc",
+    # .permission
+    "permission_override": "permission",
+    "PermissionModel": "permission",
+    "BasePermission": "permission",
+    "BasePermissionLevel": "permission",
+    "PermissionLevel": "permission",
+    "check_permission_level": "permission",
+    # .settings
+    "SettingsModel": "settings",
+    "Settings": "settings",
+    "RoleSettings": "settings",
+    # .translations
+    "language": "translations",
+    "language_wrapper": "translations",
+    "resolve_language": "translations",
+    "invalidate_language": "translations",
+    "prefetch_languages": "translations",
+    "Translations": "translations",
+    "TranslationNamespace": "translations",
+    "merge": "translations",
+    "load_translations": "translations",
+    "watch_translations": "translations",
+    "t": "translations",
+}
+_LAZY_MODULES: tuple[str, ...] = (
+    "aio",
+    "cache",
+    "colors",
+    "constants",
+    "contributors",
+    "database",
+    "enum",
+    "environment",
+    "errors",
+    "ipy_wrapper",
+    "misc",
+    "permission",
+    "settings",
+    "translations",
+    "utils",
+)
+
+__all__ = tuple(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+    elif name in _LAZY_MODULES:
+        value = import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES, *_LAZY_MODULES})
@@ -1,20 +1,80 @@
-from pathlib import Path
-from interactions.client.client import Client
-from interactions.ext.prefixed_commands.manager import setup as pc_setup
-from interactions.models.discord.enums import Intents
-from AlbertoX3 import __root_logger__
-from AlbertoX3.environment import TOKEN
-from AlbertoX3.utils.extensions import load_extensions, get_extensions
+from AlbertoX3.utils.profiling import startup_profiler
 
+with startup_profiler.phase("imports"):
+    from asyncio import create_task, wait_for
+    from pathlib import Path
+    from interactions.client.client import Client
+    from interactions.ext.prefixed_commands.manager import setup as pc_setup
+    from interactions.models.discord.enums import Intents
+    from AlbertoX3 import __root_logger__
+    from AlbertoX3.aio import thread_pool
+    from AlbertoX3.cache import invalidator
+    from AlbertoX3.database import db_context
+    from AlbertoX3.environment import CACHE_WARMUP, CACHE_WARMUP_TIMEOUT, STARTUP_PROFILE, TOKEN, TRANSLATIONS_WATCH
+    from AlbertoX3.permission import PermissionModel
+    from AlbertoX3.settings import SettingsModel
+    from AlbertoX3.translations import watch_translations
+    from AlbertoX3.utils.extensions import load_extensions, get_extensions
+    from AlbertoX3.utils.ipy import setup_name_indexes
 
-bot = Client(
-    token=TOKEN,
-    intents=Intents.ALL,  # Intent.ALL is very bad practice!!!
-)
-pc_setup(client=bot, default_prefix="t!")
-load_extensions(bot=bot, extensions=get_extensions(folder=Path("./extensions/")))
+
+with startup_profiler.phase("client"):
+    bot = Client(
+        token=TOKEN,
+        intents=Intents.ALL,  # Intent.ALL is very bad practice!!!
+    )
+    pc_setup(client=bot, default_prefix="t!")
+    setup_name_indexes(bot=bot)
+
+
+async def warm_up_cache() -> None:
+    # the invalidator clears the local caches once it's listening, so there's no point in filling them before
+    try:
+        await wait_for(invalidator.listening.wait(), CACHE_WARMUP_TIMEOUT)
+    except TimeoutError:
+        __root_logger__.warning(f"Skipped the cache warm-up, redis wasn't reachable within {CACHE_WARMUP_TIMEOUT}s")
+        return
+
+    with startup_profiler.phase("cache.warmup"):
+        async with db_context():
+            permissions = await PermissionModel.warm_up()
+            settings = await SettingsModel.warm_up()
+    __root_logger__.info(f"Warmed up the cache with {permissions} permissions and {settings} settings")
+
+
+@bot.listen()
+async def on_startup() -> None:
+    startup_profiler.end("gateway")
+
+    # keeps the local caches of every process in sync (runs as long as the bot does)
+    listener = create_task(invalidator.listen())
+
+    try:
+        if CACHE_WARMUP:
+            await warm_up_cache()
+    except Exception as e:
+        # only an optimization, the caches get filled on demand anyway
+        __root_logger__.warning(f"Unable to warm up the cache: {e!r}")
+    finally:
+        startup_profiler.finish(Path(STARTUP_PROFILE) if STARTUP_PROFILE else None)
+
+    await listener
+
+
+if TRANSLATIONS_WATCH:
+
+    @bot.listen("startup")
+    async def on_startup_watch_translations() -> None:
+        # picks up edited translation files without a restart
+        await watch_translations(interval=TRANSLATIONS_WATCH)
+
+
+with startup_profiler.phase("extensions"):
+    load_extensions(bot=bot, extensions=get_extensions(folder=Path("./extensions/")))
 
 
 __root_logger__.critical("This code is just for testing and does nothing useful by now!!!")
 
+startup_profiler.begin("gateway")
 bot.start()
+thread_pool.shutdown()
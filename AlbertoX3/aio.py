@@ -1,24 +1,46 @@
 __all__ = (
     "event_loop",
     "Thread",
+    "ThreadPool",
+    "thread_pool",
     "LockDeco",
+    "KeyLockDeco",
+    "SingleFlightDeco",
     "gather_any",
     "run_in_thread",
     "semaphore_gather",
+    "semaphore_map",
     "run_as_task",
 )
 
-from asyncio.events import AbstractEventLoop, get_event_loop, get_running_loop
+from asyncio.events import AbstractEventLoop, get_event_loop
+from asyncio.futures import wrap_future
 from asyncio.locks import Event, Lock, Semaphore
-from asyncio.tasks import create_task, gather
+from asyncio.tasks import FIRST_COMPLETED, Task, create_task, gather, shield, wait
+from concurrent.futures.thread import ThreadPoolExecutor
 from functools import partial, update_wrapper, wraps
-from threading import Thread as t_Thread
-from typing import Awaitable, Callable, Generic, Literal, ParamSpec, TypeVar, cast
+from threading import Lock as t_Lock, Thread as t_Thread
+from time import monotonic
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    Literal,
+    Optional,
+    ParamSpec,
+    TypeVar,
+    cast,
+)
 from .constants import MISSING
-from .errors import GatherAnyError
+from .errors import GatherAnyError, TaskCancelledError
 
 
 T = TypeVar("T")
+A = TypeVar("A")
 P = ParamSpec("P")
 
 _THREAD_RETURN = tuple[Literal[True], T] | tuple[Literal[False], Exception]
@@ -60,6 +82,157 @@ class Thread(t_Thread, Generic[P, T]):
         self._loop.call_soon_threadsafe(self._event.set)
 
 
+class ThreadPool:
+    """
+    A bounded pool of named worker threads, which keeps track of its load.
+    """
+
+    name: str
+    _max_workers: Optional[int]
+    _executor: Optional[ThreadPoolExecutor]
+    _lock: t_Lock
+    _queued: int
+    _active: int
+    _completed: int
+    _total_latency: float
+    _max_latency: float
+
+    def __init__(self, name: str, max_workers: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        name: str
+            The prefix for the names of the worker threads.
+        max_workers: int, optional
+            The maximum amount of worker threads. Defaults to ``THREAD_POOL_SIZE`` from the environment.
+        """
+        self.name = name
+        self._max_workers = max_workers
+        self._executor = None
+        self._lock = t_Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._total_latency = 0
+        self._max_latency = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        The executor; it's created on first use.
+        """
+        if self._executor is None:
+            if self._max_workers is None:
+                # due to the environment not being needed to import this module
+                from .environment import THREAD_POOL_SIZE
+
+                self._max_workers = THREAD_POOL_SIZE or None
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    @property
+    def max_workers(self) -> int:
+        return self.executor._max_workers  # noqa
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The amount of submitted functions, which are waiting for a worker.
+        """
+        return self._queued
+
+    @property
+    def active_workers(self) -> int:
+        """
+        The amount of workers executing a function at the moment.
+        """
+        return self._active
+
+    @property
+    def completed(self) -> int:
+        return self._completed
+
+    @property
+    def average_latency(self) -> float:
+        """
+        The average amount of seconds from submitting a function until it's done.
+        """
+        return self._total_latency / self._completed if self._completed else 0
+
+    @property
+    def max_latency(self) -> float:
+        return self._max_latency
+
+    def _call(self, submitted: float, func: Callable[[], T]) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return func()
+        finally:
+            latency = monotonic() - submitted
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._total_latency += latency
+                self._max_latency = max(self._max_latency, latency)
+
+    async def run(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """
+        Parameters
+        ----------
+        func: Callable[P, T]
+            The function to run in a worker thread.
+        args: P.args
+            The arguments for the function.
+        kwargs: P.kwargs
+            The keyword-arguments for the function.
+
+        Returns
+        -------
+        T
+            The return from the function.
+        """
+        executor = self.executor
+        with self._lock:
+            self._queued += 1
+        try:
+            future = executor.submit(self._call, monotonic(), partial(func, *args, **kwargs))
+        except BaseException:
+            self._dequeue()
+            raise
+        # only functions which never started can get cancelled
+        future.add_done_callback(lambda f: f.cancelled() and self._dequeue())
+        return await wrap_future(future)
+
+    def _dequeue(self) -> None:
+        with self._lock:
+            self._queued -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shuts the pool down; functions which haven't started yet are cancelled.
+
+        Parameters
+        ----------
+        wait: bool
+            Whether to wait for the running functions to finish.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.name!r} queued={self.queue_depth} active={self.active_workers} "
+            f"completed={self.completed} average_latency={self.average_latency:.3f}s>"
+        )
+
+
+# global pool used by ``run_in_thread``
+thread_pool: ThreadPool = ThreadPool("AlbertoX3")
+
+
 class LockDeco(Generic[T, P]):
     lock: Lock
     func: _FUNC
@@ -74,6 +247,113 @@ class LockDeco(Generic[T, P]):
             return await self.func(*args, **kwargs)
 
 
+def _default_key(*args: Hashable, **kwargs: Hashable) -> Hashable:
+    return args, tuple(sorted(kwargs.items()))
+
+
+class KeyLockDeco(Generic[T, P]):
+    """
+    Like ``LockDeco``, but with one lock per key, so calls with different keys don't block each other.
+    """
+
+    func: _FUNC
+    key: Callable[P, Hashable]
+    _locks: dict[Hashable, tuple[Lock, int]]
+
+    def __init__(self, func: _FUNC, key: Callable[P, Hashable] = _default_key):
+        """
+        Parameters
+        ----------
+        func: Callable[P, T]
+            The coroutine to lock.
+        key: Callable[P, Hashable]
+            Gets the key from the arguments. Defaults to all arguments.
+        """
+        self.func = func
+        self.key = key
+        self._locks = {}
+        update_wrapper(self, func)
+
+    @classmethod
+    def by(cls, key: Callable[P, Hashable]) -> Callable[[_FUNC], "KeyLockDeco[T, P]"]:
+        return partial(cls, key=key)
+
+    async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        key = self.key(*args, **kwargs)
+        lock, users = self._locks.get(key, (None, 0))
+        if lock is None:
+            lock = Lock()
+        self._locks[key] = lock, users + 1
+
+        try:
+            async with lock:
+                return await self.func(*args, **kwargs)
+        finally:
+            # the lock is dropped as soon as nobody uses it anymore
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = lock, users - 1
+
+
+class SingleFlightDeco(Generic[T, P]):
+    """
+    Concurrent calls with the same key share one execution of the function and all get its result.
+    Calls with different keys are executed in parallel.
+
+    The execution runs in its own task, so a cancelled caller (even the first one) doesn't affect the others.
+    It's only cancelled if every caller got cancelled.
+    """
+
+    func: _FUNC
+    key: Callable[P, Hashable]
+    _pending: dict[Hashable, tuple[Task[T], int]]
+
+    def __init__(self, func: _FUNC, key: Callable[P, Hashable] = _default_key):
+        """
+        Parameters
+        ----------
+        func: Callable[P, T]
+            The coroutine to execute.
+        key: Callable[P, Hashable]
+            Gets the key from the arguments. Defaults to all arguments.
+        """
+        self.func = func
+        self.key = key
+        self._pending = {}
+        update_wrapper(self, func)
+
+    @classmethod
+    def by(cls, key: Callable[P, Hashable]) -> Callable[[_FUNC], "SingleFlightDeco[T, P]"]:
+        return partial(cls, key=key)
+
+    async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        key = self.key(*args, **kwargs)
+        task, waiters = self._pending.get(key, (None, 0))
+        if task is None:
+            # the first caller starts the execution (with a copy of its context), everyone waits for the result
+            task = create_task(self.func(*args, **kwargs))  # type: ignore
+            task.add_done_callback(partial(self._discard, key))
+        self._pending[key] = task, waiters + 1
+
+        try:
+            # shielded, a cancelled caller mustn't cancel the result for everyone else
+            return await shield(task)
+        finally:
+            if (entry := self._pending.get(key)) is not None and entry[0] is task:
+                if entry[1] == 1:
+                    # nobody is waiting for the result anymore
+                    del self._pending[key]
+                    task.cancel()
+                else:
+                    self._pending[key] = task, entry[1] - 1
+
+    def _discard(self, key: Hashable, task: Task[T]) -> None:
+        if (entry := self._pending.get(key)) is not None and entry[0] is task:
+            del self._pending[key]
+
+
 async def gather_any(*coroutines: Awaitable[T]) -> tuple[int, T]:
     """
     Parameters
@@ -117,6 +397,8 @@ async def gather_any(*coroutines: Awaitable[T]) -> tuple[int, T]:
 
 async def run_in_thread(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
     """
+    Runs the function in a worker thread of ``thread_pool``.
+
     Parameters
     ----------
     func: Callable[P, T]
@@ -136,13 +418,7 @@ async def run_in_thread(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs)
     Exception
         Any exceptions which may be raised.
     """
-    thread = Thread(partial(func, *args, **kwargs), get_running_loop())
-    thread.start()
-    ok, result = await thread.wait()
-    if not ok:
-        raise result
-    else:
-        return cast(T, result)
+    return await thread_pool.run(func, *args, **kwargs)
 
 
 async def semaphore_gather(n: int, /, *tasks: Awaitable[T]) -> list[T]:
@@ -170,6 +446,114 @@ async def semaphore_gather(n: int, /, *tasks: Awaitable[T]) -> list[T]:
     return list(await gather(*map(inner, tasks)))
 
 
+async def semaphore_map(
+    n: int,
+    func: Callable[[A], Awaitable[T]],
+    items: Iterable[A] | AsyncIterable[A],
+    /,
+    *,
+    ordered: bool = False,
+    return_exceptions: bool = False,
+) -> AsyncIterator[T | BaseException]:
+    """
+    Applies ``func`` to every item and yields the results as soon as they are available.
+    Items are only taken from ``items`` if there is room for them, so the memory usage stays constant.
+
+    Parameters
+    ----------
+    n: int
+        The maximum amount of tasks to run simultaneously (including finished ones waiting to be yielded if ``ordered``).
+    func: Callable[[A], Awaitable[T]]
+        The coroutine function to apply.
+    items: Iterable[A] | AsyncIterable[A]
+        The items to apply ``func`` on.
+    ordered: bool
+        Whether to yield the results in the order of ``items`` or in the order they finish.
+    return_exceptions: bool
+        Whether to yield raised exceptions as results or to stop (and cancel every running task) on the first one.
+
+    Yields
+    ------
+    T | BaseException
+        The results (or exceptions if ``return_exceptions``).
+
+    Raises
+    ------
+    ValueError
+        If ``n`` is less than 1.
+    TaskCancelledError
+        If a task got cancelled by something else than ``semaphore_map`` (yielded if ``return_exceptions``).
+
+    Examples
+    --------
+    >>> async for member in semaphore_map(10, get_member_by_id, ids):
+    ...     print(member)
+    """
+    if n < 1:
+        raise ValueError(f"At least one task has to run simultaneously, got n={n}")
+
+    iterator: Iterable[A] | AsyncIterator[A]
+    if isinstance(items, AsyncIterable):
+        iterator = aiter(items)
+    else:
+        iterator = iter(items)
+
+    pending: set[Task[T]] = set()
+    indices: dict[Task[T], int] = {}
+    finished: dict[int, T | BaseException] = {}  # only used if ordered
+    submitted = 0
+    yielded = 0
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) + len(finished) < n:
+                try:
+                    if isinstance(iterator, AsyncIterator):
+                        item = await anext(iterator)
+                    else:
+                        item = next(iterator)  # type: ignore
+                except (StopIteration, StopAsyncIteration):
+                    exhausted = True
+                    break
+                pending.add(task := create_task(func(item)))  # type: ignore
+                indices[task] = submitted
+                submitted += 1
+
+            if not pending:
+                break
+
+            done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+            for task in sorted(done, key=indices.__getitem__):
+                index = indices.pop(task)
+                result: T | BaseException
+                if task.cancelled():
+                    # a bare ``CancelledError`` would look like the consumer itself got cancelled
+                    result = TaskCancelledError(index)
+                elif (e := task.exception()) is not None:
+                    result = e
+                else:
+                    result = task.result()
+
+                if isinstance(result, BaseException) and not return_exceptions:
+                    raise result
+
+                if ordered:
+                    finished[index] = result
+                else:
+                    yield result
+
+            while yielded in finished:
+                yield finished.pop(yielded)
+                yielded += 1
+
+    finally:
+        for task in pending:
+            task.cancel()
+        # retrieves the results, otherwise there are warnings about pending tasks and unretrieved exceptions
+        await gather(*pending, return_exceptions=True)
+
+
 def run_as_task(func: _FUNC) -> _FUNC:
     """
     Parameters
@@ -0,0 +1,291 @@
+__all__ = (
+    "LocalCache",
+    "CacheInvalidator",
+    "local_cache",
+    "language_cache",
+    "invalidator",
+    "warm_up_cache",
+)
+
+
+from asyncio import CancelledError, Event, sleep
+from collections import OrderedDict
+from redis.asyncio.client import Redis
+from sqlalchemy.sql.base import Executable
+from time import monotonic
+from typing import Any, Callable
+from .constants import MISSING
+from .database import db, redis
+from .environment import (
+    CACHE_INVALIDATION_CHANNEL,
+    CACHE_LANGUAGE_SIZE,
+    CACHE_LOCAL_SIZE,
+    CACHE_LOCAL_TTL,
+    CACHE_TTL,
+    CACHE_WARMUP_BATCH_SIZE,
+)
+from .utils.essentials import get_logger
+
+
+logger = get_logger()
+
+
+class LocalCache:
+    """
+    A bounded in-process cache, whose entries expire after ``ttl`` seconds.
+    If the cache is full the least recently used entry gets dropped.
+    """
+
+    maxsize: int
+    ttl: float
+    active: bool
+    """Whether the cache is used at all (e.g. it can't be trusted while invalidations can't be received)"""
+    _data: OrderedDict[str, tuple[float, Any]]
+    _generation: int
+    _hooks: list[Callable[[str], None]]
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Parameters
+        ----------
+        maxsize: int
+            The maximum amount of entries.
+        ttl: float
+            The amount of seconds until an entry expires.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.active = True
+        self._data = OrderedDict()
+        self._generation = 0
+        self._hooks = []
+
+    @property
+    def generation(self) -> int:
+        """
+        Changes with every invalidation. Get it before fetching a value and pass it to ``set``,
+        so a value fetched before an invalidation won't be cached afterwards.
+        """
+        return self._generation
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """
+        Parameters
+        ----------
+        key: str
+            The key to look up.
+        default: Any
+            Returned if the key isn't cached (or expired) or the cache isn't ``active``. Defaults to ``MISSING``.
+
+        Returns
+        -------
+        Any
+            The cached value.
+        """
+        if not self.active or (entry := self._data.get(key)) is None:
+            return default
+
+        expires, value = entry
+        if expires < monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, generation: int = MISSING) -> None:  # noqa A003
+        """
+        Parameters
+        ----------
+        key: str
+            The key to cache the value for.
+        value: Any
+            The value to cache.
+        generation: int
+            The ``generation`` from before fetching the value. If it changed in the meanwhile, the value is dropped.
+        """
+        if not self.active or (generation is not MISSING and generation != self._generation):
+            return
+
+        self._data[key] = monotonic() + self.ttl, value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        self._generation += 1
+        self._data.pop(key, None)
+        for hook in self._hooks:
+            hook(key)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._data.clear()
+
+    def add_invalidation_hook(self, hook: Callable[[str], None]) -> None:
+        """
+        Parameters
+        ----------
+        hook: Callable[[str], None]
+            Called with the key after every invalidation (local or from other processes).
+        """
+        self._hooks.append(hook)
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not MISSING  # type: ignore
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheInvalidator:
+    """
+    Invalidates keys of local caches in every process via Redis pub/sub.
+
+    The caches are only ``active`` while invalidations are received (see ``listen``).
+    """
+
+    redis: Redis
+    channel: str
+    caches: tuple[LocalCache, ...]
+    listening: Event
+    """Set as soon as invalidations are received (and the caches got cleared)"""
+
+    def __init__(self, redis: Redis, channel: str, *caches: LocalCache):
+        """
+        Parameters
+        ----------
+        redis: Redis
+            The Redis client to publish and subscribe with.
+        channel: str
+            The channel to use for invalidations.
+        caches: LocalCache
+            The caches to invalidate.
+        """
+        self.redis = redis
+        self.channel = channel
+        self.caches = caches
+        self.listening = Event()
+        self._set_active(False)
+
+    def _set_active(self, active: bool) -> None:
+        for cache in self.caches:
+            # whatever got changed while not listening can't be trusted anymore
+            cache.clear()
+            cache.active = active
+        if active:
+            self.listening.set()
+        else:
+            self.listening.clear()
+
+    def invalidate_locally(self, key: str) -> None:
+        for cache in self.caches:
+            cache.invalidate(key)
+
+    async def invalidate(self, key: str) -> None:
+        """
+        Invalidates ``key`` in this process and publishes the invalidation for every other process.
+
+        Parameters
+        ----------
+        key: str
+            The key to invalidate.
+        """
+        self.invalidate_locally(key)
+        await self.redis.publish(self.channel, key)
+
+    async def listen(self, *, retry_delay: float = 1, max_retry_delay: float = 60) -> None:
+        """
+        Listens for invalidations from other processes (runs until cancelled).
+        If the connection fails or drops, the caches are bypassed until it's established again.
+
+        Parameters
+        ----------
+        retry_delay: float
+            The seconds to wait before reconnecting, doubled for every failed attempt in a row.
+        max_retry_delay: float
+            The maximum seconds to wait before reconnecting.
+        """
+        delay = retry_delay
+        while True:
+            try:
+                await self._listen()
+            except CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Unable to receive cache invalidations ({e!r}), retrying in {delay:.1f}s")
+            else:
+                logger.warning(f"Stopped receiving cache invalidations, retrying in {delay:.1f}s")
+            finally:
+                if self.listening.is_set():
+                    # the connection worked for a while, so it's no failed attempt in a row
+                    delay = retry_delay
+                self._set_active(False)
+
+            await sleep(delay)
+            delay = min(delay * 2, max_retry_delay)
+
+    async def _listen(self) -> None:
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            logger.info(f"Listening for cache invalidations on {self.channel!r}")
+            self._set_active(True)
+
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                data = message["data"]
+                self.invalidate_locally(data.decode() if isinstance(data, bytes) else str(data))
+        finally:
+            try:
+                await pubsub.unsubscribe(self.channel)
+                await pubsub.close()
+            except Exception as e:
+                logger.debug(f"Unable to close the subscription for cache invalidations: {e!r}")
+
+
+async def warm_up_cache(statement: Executable, entry: Callable[[Any], tuple[str, Any]]) -> int:
+    """
+    Streams the rows of ``statement`` (server-side cursor) into Redis and ``local_cache``,
+    so the first lookups after a cold start don't have to query the database one by one.
+
+    Notes
+    -----
+    Has to be called within a database session (e.g. ``db_context``).
+    Should be called after ``invalidator`` started listening, otherwise ``local_cache`` gets cleared again.
+
+    Parameters
+    ----------
+    statement: Executable
+        The statement selecting the rows.
+    entry: Callable[[Any], tuple[str, Any]]
+        Returns the key and the value to cache for a row.
+
+    Returns
+    -------
+    int
+        The amount of cached rows.
+    """
+    generation = local_cache.generation
+    count = 0
+    async with redis.pipeline(transaction=False) as pipe:
+        async for row in await db.stream(statement):
+            key, value = entry(row)
+            pipe.execute_command("SETEX", key, CACHE_TTL, value)
+            local_cache.set(key, value, generation)
+            count += 1
+            if count % CACHE_WARMUP_BATCH_SIZE == 0:
+                await pipe.execute()
+        await pipe.execute()
+    return count
+
+
+# global cache in front of Redis (e.g. for ``settings:*`` and ``permissions:*``)
+local_cache: LocalCache = LocalCache(maxsize=CACHE_LOCAL_SIZE, ttl=CACHE_LOCAL_TTL)
+
+# global cache for the languages of users and guilds (``language:*``), so they can't evict settings or permissions
+language_cache: LocalCache = LocalCache(maxsize=CACHE_LANGUAGE_SIZE, ttl=CACHE_LOCAL_TTL)
+
+# global invalidator for ``local_cache`` and ``language_cache``
+invalidator: CacheInvalidator = CacheInvalidator(redis, CACHE_INVALIDATION_CHANNEL, local_cache, language_cache)
@@ -8,11 +8,14 @@ __all__ = (
 )
 
 
-from functools import partial
+from functools import partial, reduce
 from interactions.client.const import Absent, Missing
+from interactions.models.discord.enums import Permissions
 from interactions.models.discord.user import Member, User
+from operator import or_
 from pathlib import Path
-from typing import Awaitable, Callable, TYPE_CHECKING, Any, cast
+from time import monotonic
+from typing import Awaitable, Callable, TYPE_CHECKING, Any, Optional, cast
 from yaml import safe_load
 from .contributors import Contributor
 from .errors import InvalidPermissionLevelError
@@ -79,13 +82,16 @@ class Config:
         # due to circular imports
         from .utils.essentials import get_bool
         from .utils.extensions import get_extensions
+        from .utils.profiling import startup_profiler
         from .utils.terminal import get_lib_version
 
-        config: dict[str, Any] = safe_load(path.read_text("utf-8"))
+        with startup_profiler.phase("config.yaml"):
+            config: dict[str, Any] = safe_load(path.read_text("utf-8"))
 
         # bot
         cls.NAME = config.get("name", MISSING)
-        cls.VERSION = get_lib_version()
+        with startup_profiler.phase("config.version"):
+            cls.VERSION = get_lib_version()
         cls.PREFIX = config["prefix"]
 
         # repo
@@ -116,7 +122,8 @@ class Config:
         if not folder.is_absolute():
             folder = path.parent.joinpath(folder)
         cls.EXTENSIONS_FOLDER = folder
-        cls.EXTENSIONS = get_extensions()
+        with startup_profiler.phase("extensions.discovery"):
+            cls.EXTENSIONS = get_extensions()
 
         # tmp
         tmp: dict[str, str | dict[str, str]] = config.get("tmp", {})
@@ -162,6 +169,8 @@ class Config:
         permission_level_default_raw: str,
         permission_default_overrides_raw: dict[str, dict[str, str]],
     ) -> None:
+        from .cache import local_cache
+        from .environment import CACHE_LOCAL_TTL
         from .permission import BasePermissionLevel, PermissionLevel
         from .settings import RoleSettings
 
@@ -190,9 +199,9 @@ class Config:
             k.upper(): v for k, v in sorted(permission_levels.items(), key=lambda pl: pl[1].level, reverse=True)
         }
         cls.PERMISSION_LEVELS = BasePermissionLevel("PermissionLevel", permission_levels)
-        cls.PERMISSION_LEVELS._get_permission_level = classmethod(
-            partial(_get_permission_level, permission_levels, RoleSettings.get)
-        )
+        role_level_index = _RoleLevelIndex(permission_levels, RoleSettings.get, CACHE_LOCAL_TTL)
+        local_cache.add_invalidation_hook(role_level_index.invalidate)
+        cls.PERMISSION_LEVELS._get_permission_level = classmethod(partial(_get_permission_level, role_level_index))
 
         cls.PERMISSION_LEVEL_TEAM = getattr(cls.PERMISSION_LEVELS, permission_level_team_raw.upper())
         cls.PERMISSION_DEFAULT_LEVEL = getattr(cls.PERMISSION_LEVELS, permission_level_default_raw.upper())
@@ -204,29 +213,92 @@ class Config:
                 )
 
 
+class _RoleLevelIndex:
+    """
+    Maps role ids and guild permissions to the highest permission level they grant.
+    The role ids are resolved once and get resolved again after a role setting changed (or ``ttl`` passed).
+    """
+
+    _keys: list[str]
+    _masks: list[tuple[int, int]]
+    _role_names: list[tuple[int, str]]
+    _get_role_setting: Callable[[str], Awaitable[int]]
+    _ttl: float
+    _index: Optional[dict[int, int]]
+    _expires: float
+    _generation: int
+
+    def __init__(
+        self,
+        permission_levels: dict[str, "PermissionLevel"],
+        get_role_setting: Callable[[str], Awaitable[int]],  # is AlbertoX3.settings.RoleSettings.get
+        ttl: float,
+    ):
+        # everything refers to the rank of a level (position in ``permission_levels``, the lower the higher)
+        self._keys = [k.upper() for k in permission_levels]
+        self._masks = [
+            (rank, reduce(or_, (Permissions[p.upper()] for p in v.guild_permissions), 0))
+            for rank, v in enumerate(permission_levels.values())
+            if v.guild_permissions
+        ]
+        self._role_names = [(rank, r) for rank, v in enumerate(permission_levels.values()) for r in v.roles]
+        self._get_role_setting = get_role_setting
+        self._ttl = ttl
+        self._index = None
+        self._expires = 0
+        self._generation = 0
+
+    def invalidate(self, key: str) -> None:
+        if key.startswith("settings:role:"):
+            self._generation += 1
+            self._index = None
+
+    async def _get_index(self) -> dict[int, int]:
+        if self._index is not None and self._expires > monotonic():
+            return self._index
+
+        generation = self._generation
+        names = list({name for _, name in self._role_names})
+        # one after another, the settings may be loaded from the database with the session of the invocation,
+        # which doesn't allow concurrent operations (this only happens once per ``ttl``)
+        role_ids = {name: await self._get_role_setting(name) for name in names}
+
+        index: dict[int, int] = {}
+        for rank, name in self._role_names:
+            if (role_id := role_ids[name]) not in index or index[role_id] > rank:
+                index[role_id] = rank
+
+        if generation == self._generation:
+            self._index, self._expires = index, monotonic() + self._ttl
+        return index
+
+    async def get_level(self, member: Member) -> Optional[str]:
+        """
+        Returns
+        -------
+        str, optional
+            The name of the highest permission level of ``member`` or ``None`` if no level matches.
+        """
+        guild_permissions = member.guild_permissions
+        ranks = [rank for rank, mask in self._masks if guild_permissions & mask]
+
+        index = await self._get_index()
+        ranks.extend(index[role.id] for role in member.roles if role.id in index)
+
+        return self._keys[min(ranks)] if ranks else None
+
+
 async def _get_permission_level(
-    permission_levels: dict[str, "PermissionLevel"],
-    get_role_setting: Callable[[str], Awaitable[int]],  # is AlbertoX3.settings.RoleSettings.get
+    role_level_index: _RoleLevelIndex,
     cls: "BasePermissionLevel",
     member: User | Member,
 ) -> "BasePermissionLevel":
     if isinstance(member, User):
         return cls.PUBLIC
 
-    roles = {role.id for role in member.roles}
-
-    async def has_role(role_name: str) -> bool:
-        return await get_role_setting(role_name) in roles
-
-    for k, v in permission_levels.items():
-        if any(getattr(member.guild_permissions, p.upper()) for p in v.guild_permissions):
-            return getattr(cls, k.upper())
-
-        for r in v.roles:
-            if await has_role(r):
-                return getattr(cls, k.upper())
-
-    return cls.PUBLIC
+    if (level := await role_level_index.get_level(member)) is None:
+        return cls.PUBLIC
+    return getattr(cls, level)
 
 
 class StyleConfig:
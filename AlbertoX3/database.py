@@ -5,9 +5,11 @@ __all__ = (
     "delete",
     "Base",
     "UTCDatetime",
+    "SessionScope",
     "DB",
     "db_context",
     "db_wrapper",
+    "db_invocation_wrapper",
     "get_database",
     "db",
     "redis",
@@ -18,7 +20,7 @@ from asyncio.locks import Event
 from contextlib import asynccontextmanager
 from contextvars import ContextVar
 from datetime import datetime, timezone
-from functools import wraps, partial
+from functools import cached_property, partial, wraps
 from redis.asyncio.client import Redis
 from sqlalchemy.ext.asyncio.engine import AsyncEngine, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession
@@ -53,6 +55,7 @@ from .environment import (
 )
 from .errors import NoActiveSessionError
 from .utils.essentials import get_logger
+from .utils.profiling import startup_profiler
 
 
 logger = get_logger()
@@ -60,6 +63,7 @@ T = TypeVar("T")
 P = ParamSpec("P")
 
 
+# redis-py connects on first use, so this is cheap
 redis: Redis = Redis(
     host=REDIS_HOST,
     port=REDIS_PORT,
@@ -134,14 +138,29 @@ class UTCDatetime(TypeDecorator):
         return datetime
 
 
+class SessionScope:
+    """
+    Holds the session of a database context, which will be created on first use.
+    """
+
+    __slots__ = ("session", "close_event")
+
+    session: Optional[AsyncSession]
+    close_event: Event
+
+    def __init__(self):
+        self.session = None
+        self.close_event = Event()
+
+
 class DB:
     """
     A database connection.
     """
 
-    engine: AsyncEngine
-    _session: ContextVar[Optional[AsyncSession]]
-    _close_event: ContextVar[Optional[Event]]
+    url: URL
+    _engine_options: dict[str, Any]
+    _scope: ContextVar[Optional[SessionScope]]
 
     def __init__(
         self,
@@ -180,15 +199,15 @@ class DB:
         echo: bool
             Whether SQL queries should be logged or not.
         """
-        self.engine = create_async_engine(
-            URL.create(
-                drivername=driver,
-                username=username,
-                password=password,
-                host=host,
-                port=port,
-                database=database,
-            ),
+        self.url = URL.create(
+            drivername=driver,
+            username=username,
+            password=password,
+            host=host,
+            port=port,
+            database=database,
+        )
+        self._engine_options = dict(
             pool_pre_ping=True,
             pool_recycle=pool_recycle,
             pool_size=pool_size,
@@ -196,8 +215,14 @@ class DB:
             echo=echo,
         )
 
-        self._session = ContextVar("session", default=None)
-        self._close_event = ContextVar("close_event", default=None)
+        self._scope = ContextVar("scope", default=None)
+
+    @cached_property
+    def engine(self) -> AsyncEngine:
+        """
+        The engine, which will be created on first access (this also imports the driver).
+        """
+        return create_async_engine(self.url, **self._engine_options)
 
     async def create_tables(self) -> None:
         """
@@ -207,8 +232,9 @@ class DB:
 
         logger.debug(f"Creating following tables (if they don't exist): {', '.join([t.name for t in tables])}")
 
-        async with self.engine.begin() as conn:
-            await conn.run_sync(partial(Base.metadata.create_all, tables=tables))
+        with startup_profiler.phase("database.tables"):
+            async with self.engine.begin() as conn:
+                await conn.run_sync(partial(Base.metadata.create_all, tables=tables))
 
     async def add(self, obj: T, commit: bool = False) -> T:
         self.session.add(obj)
@@ -244,37 +270,73 @@ class DB:
         return await self.first(filter_by(cls, *args, **kwargs))
 
     async def commit(self) -> None:
-        await self.session.commit()
+        if (scope := self._active_scope).session is not None:
+            await scope.session.commit()
+
+    async def rollback(self) -> None:
+        if (scope := self._active_scope).session is not None:
+            await scope.session.rollback()
 
     async def close(self) -> None:
-        await self.session.close()
-        self._close_event.get().set()  # type: ignore
+        if (scope := self._active_scope).session is not None:
+            await scope.session.close()
+        scope.close_event.set()
 
-    def create_session(self) -> AsyncSession:
-        self._session.set(session := AsyncSession(self.engine, expire_on_commit=False))
-        self._close_event.set(Event())
-        return session
+    async def close_scope(self, scope: SessionScope, commit: bool = True) -> None:
+        """
+        Commits and closes the session of ``scope`` (if one was opened) and sets its close event.
+
+        Parameters
+        ----------
+        scope: SessionScope
+            The scope to close.
+        commit: bool
+            Whether to commit the session before closing it (otherwise uncommitted changes are discarded).
+        """
+        try:
+            if scope.session is not None:
+                try:
+                    if commit:
+                        await scope.session.commit()
+                finally:
+                    await scope.session.close()
+        finally:
+            scope.close_event.set()
 
     @property
-    def session(self) -> AsyncSession:
-        if (session := self._session.get()) is None:
+    def active(self) -> bool:
+        """
+        Whether there is an active scope (e.g. within ``db_context`` or a command invocation).
+        """
+        return self._scope.get() is not None
+
+    @property
+    def _active_scope(self) -> SessionScope:
+        if (scope := self._scope.get()) is None:
             raise NoActiveSessionError
-        return session
+        return scope
+
+    @property
+    def session(self) -> AsyncSession:
+        if (scope := self._active_scope).session is None:
+            scope.session = AsyncSession(self.engine, expire_on_commit=False)
+        return scope.session
 
     async def wait_for_close_event(self) -> None:
-        if (event := self._close_event.get()) is None:
-            raise NoActiveSessionError
-        await event.wait()
+        await self._active_scope.close_event.wait()
 
 
 @asynccontextmanager
-async def db_context() -> AsyncGenerator:
-    db.create_session()
+async def db_context(commit: bool = True) -> AsyncGenerator:
+    # the session is only opened if it's used, otherwise there is nothing to commit or close
+    token = db._scope.set(scope := SessionScope())
     try:
         yield
     finally:
-        await db.commit()
-        await db.close()
+        try:
+            await db.close_scope(scope, commit=commit)
+        finally:
+            db._scope.reset(token)
 
 
 def db_wrapper(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
@@ -286,6 +348,23 @@ def db_wrapper(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
     return decorator
 
 
+def db_invocation_wrapper(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """
+    Like ``db_wrapper``, but every wrapped callable of the same invocation (e.g. the checks, callbacks and
+    error-callback of a command) shares the session of the invocation (see ``Extension``).
+    Without an active scope (e.g. if called directly) it behaves like ``db_wrapper``.
+    """
+
+    @wraps(func)
+    async def decorator(*args: P.args, **kwargs: P.kwargs) -> T:
+        if db.active:
+            return await func(*args, **kwargs)
+        async with db_context():
+            return await func(*args, **kwargs)
+
+    return decorator
+
+
 def get_database() -> DB:
     """
     Creates a database object from environment variables.
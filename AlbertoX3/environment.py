@@ -2,6 +2,13 @@ __all__ = (
     "TOKEN",
     "OWNER_ID",
     "LOG_LEVEL",
+    "VERSION_OVERRIDE",
+    "VERSION_STAMP",
+    "THREAD_POOL_SIZE",
+    "STARTUP_PROFILE",
+    "EXTENSIONS_MANIFEST",
+    "TRANSLATIONS_CACHE",
+    "TRANSLATIONS_WATCH",
     "DB_DRIVER",
     "DB_HOST",
     "DB_PORT",
@@ -13,6 +20,13 @@ __all__ = (
     "DB_POOL_MAX_OVERFLOW",
     "DB_SHOW_SQL_STATEMENTS",
     "CACHE_TTL",
+    "CACHE_LOCAL_TTL",
+    "CACHE_LOCAL_SIZE",
+    "CACHE_LANGUAGE_SIZE",
+    "CACHE_INVALIDATION_CHANNEL",
+    "CACHE_WARMUP",
+    "CACHE_WARMUP_BATCH_SIZE",
+    "CACHE_WARMUP_TIMEOUT",
     "REDIS_HOST",
     "REDIS_PORT",
     "REDIS_DB",
@@ -23,11 +37,15 @@ __all__ = (
 from dotenv.main import load_dotenv
 from os import environ, getenv
 from typing import cast
+from .constants import LIB_PATH
 from .utils.essentials import get_bool
 
 
 load_dotenv()
 
+# default location of the generated files, independent of the working directory
+_CACHE_FOLDER = LIB_PATH.parent.joinpath(".cache")
+
 
 TOKEN: str = environ["TOKEN"]
 OWNER_ID: int = int(environ.get("OWNER_ID", -1))
@@ -37,6 +55,18 @@ LOG_LEVEL = cast(str, environ.get("LOG_LEVEL", "NOTSET"))
 if LOG_LEVEL.isnumeric():
     LOG_LEVEL = int(LOG_LEVEL)
 
+VERSION_OVERRIDE: str = getenv("VERSION_OVERRIDE", "").strip()
+VERSION_STAMP: str = getenv("VERSION_STAMP", str(_CACHE_FOLDER / "version.stamp")).strip()  # empty disables it
+
+THREAD_POOL_SIZE: int = int(getenv("THREAD_POOL_SIZE", 0))  # 0 means default size
+
+STARTUP_PROFILE: str = getenv("STARTUP_PROFILE", "").strip()  # path for the JSON report, empty only logs it
+
+# an empty path disables the manifest or the parse cache
+EXTENSIONS_MANIFEST: str = getenv("EXTENSIONS_MANIFEST", str(_CACHE_FOLDER / "extensions.json")).strip()
+TRANSLATIONS_CACHE: str = getenv("TRANSLATIONS_CACHE", str(_CACHE_FOLDER / "translations.json")).strip()
+TRANSLATIONS_WATCH: float = float(getenv("TRANSLATIONS_WATCH", 0))  # polling interval in seconds, 0 disables it
+
 DB_DRIVER: str = getenv("DB_DRIVER", "mysql+aiomysql")
 DB_HOST: str = getenv("DB_HOST", "localhost")
 DB_PORT: int = int(getenv("DB_PORT", 3306))
@@ -52,6 +82,13 @@ DB_POOL_MAX_OVERFLOW: int = int(getenv("DB_POOL_MAX_OVERFLOW", 20))
 DB_SHOW_SQL_STATEMENTS: bool = get_bool(getenv("DB_SHOW_SQL_STATEMENTS", False))
 
 CACHE_TTL: int = int(getenv("CACHE_TTL", 3600))
+CACHE_LOCAL_TTL: int = int(getenv("CACHE_LOCAL_TTL", 300))
+CACHE_LOCAL_SIZE: int = int(getenv("CACHE_LOCAL_SIZE", 4096))
+CACHE_LANGUAGE_SIZE: int = int(getenv("CACHE_LANGUAGE_SIZE", 4096))
+CACHE_INVALIDATION_CHANNEL: str = getenv("CACHE_INVALIDATION_CHANNEL", "AlbertoX3:cache:invalidate")
+CACHE_WARMUP: bool = get_bool(getenv("CACHE_WARMUP", False))  # preloads permissions and settings on startup
+CACHE_WARMUP_BATCH_SIZE: int = int(getenv("CACHE_WARMUP_BATCH_SIZE", 1000))
+CACHE_WARMUP_TIMEOUT: float = float(getenv("CACHE_WARMUP_TIMEOUT", 10))  # seconds to wait for redis before skipping
 
 REDIS_HOST: str = getenv("REDIS_HOST", "localhost")
 REDIS_PORT: int = int(getenv("REDIS_PORT", 6379))
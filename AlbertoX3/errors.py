@@ -5,6 +5,7 @@ __all__ = (
     "UnrecognisedPermissionLevelError",
     "InvalidPermissionLevelError",
     "GatherAnyError",
+    "TaskCancelledError",
     "UnrecognisedBooleanError",
     "TranslationError",
     "UnsupportedTranslationTypeError",
@@ -15,6 +16,7 @@ __all__ = (
     "ExtensionLoadingError",
     "NoExtensionError",
     "TooMayExtensionsError",
+    "ExtensionNotLoadedError",
 )
 
 
@@ -72,6 +74,16 @@ class GatherAnyError(AlbertoX3Error):
         return f"An error occurred in coroutine {self.idx} while gathering: {self.exception}"
 
 
+class TaskCancelledError(AlbertoX3Error):
+    idx: int
+
+    def __init__(self, idx: int):
+        self.idx = idx
+
+    def __str__(self) -> str:
+        return f"The task of item {self.idx} got cancelled"
+
+
 class UnrecognisedBooleanError(AlbertoX3Error):
     obj: object
 
@@ -150,3 +162,8 @@ class NoExtensionError(ExtensionLoadingError):
 class TooMayExtensionsError(ExtensionLoadingError):
     def __str__(self) -> str:
         return f"Too many extensions classes found in {self.extension.package}!"
+
+
+class ExtensionNotLoadedError(ExtensionLoadingError):
+    def __str__(self) -> str:
+        return f"The extension {self.extension.package} isn't loaded!"
@@ -1,12 +1,15 @@
 __all__ = ("Extension",)
 
 
+from functools import cache
 from interactions.models.internal.command import BaseCommand as ipy_BaseCommand
+from interactions.models.internal.context import BaseContext as ipy_BaseContext
 from interactions.models.internal.extension import Extension as ipy_Extension
 from interactions.models.internal.listener import Listener as ipy_Listener
 from interactions.models.internal.tasks.task import Task as ipy_Task
-from typing import TypeVar, ParamSpec, Callable, Awaitable, TypedDict, Required, Any
-from .database import db_wrapper
+from typing import TypeVar, ParamSpec, Callable, Awaitable, TypedDict, Required, Any, cast
+from .database import db, db_context, db_invocation_wrapper, db_wrapper
+from .misc import SubclassRegistry
 from .translations import language_wrapper
 from .utils.essentials import get_logger
 
@@ -16,13 +19,78 @@ T = TypeVar("T")
 P = ParamSpec("P")
 
 
-def multi_wrap(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+def multi_wrap(func: Callable[P, Awaitable[T]], *, invocation: bool = False) -> Callable[P, Awaitable[T]]:
+    """
+    Wraps ``func`` with the database and language wrappers.
+
+    Parameters
+    ----------
+    func: Callable[P, Awaitable[T]]
+        The function to wrap.
+    invocation: bool
+        Whether the database session should be shared with every other wrapped function of the same invocation.
+        Should be used for everything called by a command (checks, callbacks, ...).
+
+    Returns
+    -------
+    Callable[P, Awaitable[T]]
+        The wrapped function.
+    """
     if getattr(func, "_is_multi_wrapped_by_ipy_wrapper", False) is False:
-        func = db_wrapper(language_wrapper(func))
+        func = (db_invocation_wrapper if invocation else db_wrapper)(language_wrapper(func))
         func._is_multi_wrapped_by_ipy_wrapper = True
     return func
 
 
+@cache
+def _invocation_command_class(cls: type[ipy_BaseCommand]) -> type[ipy_BaseCommand]:
+    """
+    Creates a subclass of ``cls``, whose invocations share one database session (see ``db_invocation_wrapper``).
+    The session is committed and closed before the invocation returns, if the commit fails the exception is handled
+    like an exception of the callback (``error_callback``, ``extension_error`` or raised).
+    """
+    call = cls.__call__
+
+    async def __call__(self: ipy_BaseCommand, context: ipy_BaseContext, *args: Any, **kwargs: Any) -> None:
+        if db.active:
+            # e.g. a subcommand invoked by its parent command
+            return await call(self, context, *args, **kwargs)
+
+        # committed right here (only once), so a failing commit can be handled like any other exception
+        async with db_context(commit=False):
+            try:
+                await call(self, context, *args, **kwargs)
+            finally:
+                # like ``db_context``, the changes are committed even if the command raised
+                try:
+                    await db.commit()
+                except Exception as e:
+                    await db.rollback()
+                    if self.error_callback:
+                        await self.error_callback(e, context, *args, **kwargs)
+                    elif self.extension and self.extension.extension_error:
+                        await self.extension.extension_error(e, context, *args, **kwargs)
+                    else:
+                        raise
+                    # whatever the error handler changed
+                    await db.commit()
+
+    return cast(
+        type[ipy_BaseCommand],
+        type(
+            cls.__name__,
+            (cls,),
+            {
+                "__slots__": (),
+                "__call__": __call__,
+                "__module__": cls.__module__,
+                "__qualname__": cls.__qualname__,
+                "_is_invocation_command_by_ipy_wrapper": True,
+            },
+        ),
+    )
+
+
 class _Requirements(TypedDict):
     """Means ``dict[Literal["lib", "ext"], list[str]]`` and translates to ``{"lib": [], "ext": []}``"""
 
@@ -38,21 +106,48 @@ class Extension(ipy_Extension):
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         cls._sanity_check()
+        _subclasses.register(cls)
         for attr in dir(cls):
             val = getattr(cls, attr)
             if isinstance(val, ipy_BaseCommand):
+                if getattr(val, "_is_invocation_command_by_ipy_wrapper", False) is False:
+                    val.__class__ = _invocation_command_class(type(val))
                 if val.checks:
-                    val.checks = [multi_wrap(check) for check in val.checks]
+                    val.checks = [multi_wrap(check, invocation=True) for check in val.checks]
                 if val.error_callback:
-                    val.error_callback = multi_wrap(val.error_callback)
+                    val.error_callback = multi_wrap(val.error_callback, invocation=True)
                 if val.pre_run_callback:
-                    val.pre_run_callback = multi_wrap(val.pre_run_callback)
+                    val.pre_run_callback = multi_wrap(val.pre_run_callback, invocation=True)
                 if val.post_run_callback:
-                    val.post_run_callback = multi_wrap(val.post_run_callback)
-            if isinstance(val, (ipy_BaseCommand, ipy_Listener, ipy_Task)):
+                    val.post_run_callback = multi_wrap(val.post_run_callback, invocation=True)
+                if val.callback:
+                    val.callback = multi_wrap(val.callback, invocation=True)
+            elif isinstance(val, (ipy_Listener, ipy_Task)):
                 if val.callback:
                     val.callback = multi_wrap(val.callback)
 
+    def export_state(self) -> dict[str, Any]:
+        """
+        Gets called before the extension is reloaded; the returned state is passed to ``import_state``
+        of the new instance.
+
+        Returns
+        -------
+        dict[str, Any]
+            The state to keep.
+        """
+        return {}
+
+    def import_state(self, state: dict[str, Any]) -> None:
+        """
+        Gets called after the extension got reloaded.
+
+        Parameters
+        ----------
+        state: dict[str, Any]
+            The state returned by ``export_state`` of the old instance.
+        """
+
     @classmethod
     def _sanity_check(cls) -> bool:
         all_good = True
@@ -86,3 +181,7 @@ class Extension(ipy_Extension):
             )
 
         return all_good
+
+
+# every extension class by its package (filled by ``Extension.__init_subclass__``)
+_subclasses: SubclassRegistry = SubclassRegistry(Extension)
@@ -4,24 +4,58 @@ __all__ = (
     "FormatStr",
     "EXTENSION_FEATURES",
     "PrimitiveExtension",
+    "SubclassRegistry",
 )
 
 
+import sys
 from abc import ABC, abstractmethod
 from interactions.client.const import MISSING
 from pathlib import Path
-from typing import Callable, Iterable, Literal
+from string import Formatter
+from typing import Iterable, Literal, Optional, TypeVar
 from .utils.essentials import get_logger
 
 
 logger = get_logger()
+T = TypeVar("T", bound=type)
+
+
+def _get_static(template: str) -> Optional[str]:
+    """
+    Returns the rendered template if it has no replacement fields, otherwise None.
+    """
+    try:
+        parsed = list(Formatter().parse(template))
+    except ValueError:
+        # invalid template, let ``str.format`` raise the error when rendering
+        return None
+
+    if any(field is not None for _, field, _, _ in parsed):
+        return None
+    return "".join(literal for literal, _, _, _ in parsed)
 
 
 class FormatStr(str):
-    __call__: Callable[..., str] = str.format
+    """
+    A ``str`` which gets formatted when called.
+    The template is parsed once, templates without replacement fields are rendered without ``str.format``.
+    """
+
+    _static: Optional[str]
+
+    def __new__(cls, template: str = ""):
+        self = super().__new__(cls, template)
+        self._static = _get_static(template)
+        return self
 
+    def __call__(self, *args: object, **kwargs: object) -> str:
+        if self._static is not None:
+            return self._static
+        return self.format(*args, **kwargs)
 
-_EXTENSION_FEATURES = Literal["ext", "colors", "db", "permissions", "settings", "stats"]
+
+_EXTENSION_FEATURES = Literal["ext", "colors", "db", "permissions", "settings", "stats", "lazy"]
 
 # only public because this might be of interest and not in .constants since it's required in here
 EXTENSION_FEATURES: tuple[_EXTENSION_FEATURES] = _EXTENSION_FEATURES.__args__  # type: ignore
@@ -87,5 +121,121 @@ class PrimitiveExtension(ExtensionFeaturesGenerator):
     def _has(self, i: int) -> bool:
         return (self.features & (1 << i)) == (1 << i)
 
+    def _key(self) -> tuple[str, str, str, Path, int]:
+        return self.folder, self.group, self.name, self.path, self.features
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PrimitiveExtension):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} {self.full_name!r} ({self.features})>"
+
+
+class SubclassRegistry:
+    """
+    Keeps track of the direct subclasses of a base class by the package they are defined in.
+    Has to be filled by the base class (e.g. in ``__init_subclass__``).
+    """
+
+    _registries: dict[type, "SubclassRegistry"] = {}
+
+    base: type
+    _classes: dict[str, dict[str, type]]
+
+    def __init__(self, base: type):
+        """
+        Parameters
+        ----------
+        base: type
+            The base class to keep track of the subclasses of.
+        """
+        self.base = base
+        self._classes = {}
+        SubclassRegistry._registries[base] = self
+
+    @classmethod
+    def of(cls, base: type) -> Optional["SubclassRegistry"]:
+        """
+        Parameters
+        ----------
+        base: type
+            The base class to get the registry of.
+
+        Returns
+        -------
+        SubclassRegistry, optional
+            The registry of ``base``, ``None`` if it has none.
+        """
+        return cls._registries.get(base)
+
+    @classmethod
+    def registries(cls) -> list["SubclassRegistry"]:
+        return list(cls._registries.values())
+
+    def register(self, subclass: T) -> T:
+        """
+        Registers ``subclass`` if it's a direct subclass of ``base``.
+        A class with the same module and name (e.g. from before a reload) gets replaced.
+
+        Parameters
+        ----------
+        subclass: type
+            The subclass to register.
+
+        Returns
+        -------
+        type
+            ``subclass``
+        """
+        if self.base in subclass.__bases__:
+            module = sys.modules.get(subclass.__module__)
+            package = getattr(module, "__package__", None) or subclass.__module__.rpartition(".")[0]
+            self._classes.setdefault(package, {})[f"{subclass.__module__}.{subclass.__qualname__}"] = subclass
+        return subclass
+
+    def get(self, package: str) -> list[type]:
+        """
+        Parameters
+        ----------
+        package: str
+            The package to get the subclasses of.
+
+        Returns
+        -------
+        list[type]
+            The subclasses defined in ``package`` (in the order they got registered).
+        """
+        return list(self._classes.get(package, {}).values())
+
+    def all(self) -> list[type]:  # noqa A003
+        return [subclass for classes in self._classes.values() for subclass in classes.values()]
+
+    def clear(self, package: str) -> dict[str, type]:
+        """
+        Parameters
+        ----------
+        package: str
+            The package to remove the subclasses of (e.g. before it gets reloaded).
+
+        Returns
+        -------
+        dict[str, type]
+            The removed subclasses, can be passed to ``restore``.
+        """
+        return self._classes.pop(package, {})
+
+    def restore(self, package: str, classes: dict[str, type]) -> None:
+        """
+        Parameters
+        ----------
+        package: str
+            The package to restore the subclasses of.
+        classes: dict[str, type]
+            The subclasses returned by ``clear`` (they replace the ones registered in the meanwhile).
+        """
+        self._classes[package] = self._classes.get(package, {}) | classes
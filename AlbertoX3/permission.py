@@ -17,10 +17,13 @@ from interactions.models.internal.command import check
 from interactions.models.internal.context import BaseContext
 from sqlalchemy.sql.schema import Column
 from sqlalchemy.sql.sqltypes import Integer, String
-from typing import Awaitable, Callable, cast
-from .database import Base, db, redis
+from typing import Any, Awaitable, Callable, cast
+from .cache import invalidator, local_cache, warm_up_cache
+from .constants import MISSING
+from .database import Base, db, redis, select
 from .environment import CACHE_TTL
 from .errors import UnrecognisedPermissionLevelError
+from .misc import SubclassRegistry
 
 
 permission_override: ContextVar["BasePermissionLevel"] = ContextVar("permission_override")
@@ -38,18 +41,29 @@ class PermissionModel(Base):
 
     @staticmethod
     async def get(permission: str, default: int) -> int:
-        if (value := await redis.execute_command("GET", rkey := f"permissions:{permission}")) is not None:
+        if (value := local_cache.get(rkey := f"permissions:{permission}")) is not MISSING:
+            return value
+
+        generation = local_cache.generation
+        if (value := await redis.execute_command("GET", rkey)) is not None:
+            local_cache.set(rkey, int(value), generation)
             return int(value)
 
         if (row := await db.get(PermissionModel, permission=permission)) is None:
             row = await PermissionModel.create(permission=permission, level=default)
 
         await redis.execute_command("SETEX", rkey, CACHE_TTL, cast(int, row.level))
+        local_cache.set(rkey, cast(int, row.level), generation)
         return cast(int, row.level)
 
+    @staticmethod
+    async def warm_up() -> int:
+        return await warm_up_cache(select(PermissionModel), lambda row: (f"permissions:{row.permission}", row.level))
+
     @staticmethod
     async def set(permission: str, level: int) -> "PermissionModel":  # noqa A003
-        await redis.execute_command("SETEX", f"permissions:{permission}", CACHE_TTL, level)
+        await redis.execute_command("SETEX", rkey := f"permissions:{permission}", CACHE_TTL, level)
+        await invalidator.invalidate(rkey)
 
         if (row := await db.get(PermissionModel, permission=permission)) is None:
             row = await PermissionModel.create(permission=permission, level=level)
@@ -59,6 +73,10 @@ class PermissionModel(Base):
 
 
 class BasePermission(Enum):
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _subclasses.register(cls)
+
     @property
     def description(self) -> str:
         raise NotImplementedError
@@ -98,6 +116,10 @@ class BasePermission(Enum):
         return check_permission_level(self)
 
 
+# every permission enum by its package (filled by ``BasePermission.__init_subclass__``)
+_subclasses: SubclassRegistry = SubclassRegistry(BasePermission)
+
+
 PermissionLevel = namedtuple("PermissionLevel", ["level", "aliases", "description", "guild_permissions", "roles"])
 
 
@@ -10,8 +10,10 @@ from aenum import NoAliasEnum
 from sqlalchemy.sql.schema import Column
 from sqlalchemy.sql.sqltypes import String, Text
 from typing import cast
-from .aio import LockDeco
-from .database import Base, db, redis
+from .aio import KeyLockDeco, SingleFlightDeco
+from .cache import invalidator, local_cache, warm_up_cache
+from .constants import MISSING
+from .database import Base, db, db_context, redis, select
 from .environment import CACHE_TTL
 
 
@@ -29,27 +31,44 @@ class SettingsModel(Base):
         return await db.add(SettingsModel(key=key, value=str(int(value) if isinstance(value, bool) else value)))
 
     @staticmethod
-    @LockDeco
     async def get(dtype: type[_VALUE], key: str, default: _VALUE) -> _VALUE:
-        if (out := await redis.execute_command("GET", rkey := f"settings:{key}")) is None:
-            if (row := await db.get(SettingsModel, key=key)) is None:
-                row = await SettingsModel._create(key, default)
-            out = cast(_VALUE, row.value)
-            await redis.execute_command("SETEX", rkey, CACHE_TTL, out)
+        if (out := local_cache.get(rkey := f"settings:{key}")) is MISSING:
+            out = await SettingsModel._fetch(rkey, key, default)
 
         return dtype(int(out) if dtype is bool else out)
 
     @staticmethod
-    @LockDeco
+    @SingleFlightDeco.by(lambda rkey, key, default: rkey)
+    async def _fetch(rkey: str, key: str, default: _VALUE) -> _VALUE:
+        generation = local_cache.generation
+        if (out := await redis.execute_command("GET", rkey)) is None:
+            # shared by every caller, so it mustn't use the session of one of them (it may be closed in the meanwhile)
+            async with db_context():
+                if (row := await db.get(SettingsModel, key=key)) is None:
+                    row = await SettingsModel._create(key, default)
+                out = cast(_VALUE, row.value)
+            await redis.execute_command("SETEX", rkey, CACHE_TTL, out)
+
+        local_cache.set(rkey, out, generation)
+        return out
+
+    @staticmethod
+    async def warm_up() -> int:
+        return await warm_up_cache(select(SettingsModel), lambda row: (f"settings:{row.key}", row.value))
+
+    @staticmethod
+    @KeyLockDeco.by(lambda dtype, key, value: key)
     async def set(dtype: type[_VALUE], key: str, value: _VALUE) -> "SettingsModel":  # noqa A003
         rkey = f"settings:{key}"
         if (row := await db.get(SettingsModel, key=key)) is None:
             row = await SettingsModel._create(key, value)
             await redis.execute_command("SETEX", rkey, CACHE_TTL, cast(str, row.value))
+            await invalidator.invalidate(rkey)
             return row
 
         row.value = str(int(value) if dtype is bool else value)
         await redis.execute_command("SETEX", rkey, CACHE_TTL, row.value)
+        await invalidator.invalidate(rkey)
         return row
 
 
@@ -1,25 +1,44 @@
 __all__ = (
     "language",
     "language_wrapper",
+    "resolve_language",
+    "invalidate_language",
+    "prefetch_languages",
     "Translations",
     "TranslationNamespace",
     "merge",
     "load_translations",
+    "watch_translations",
     "t",
 )
 
 
+from asyncio import sleep
 from contextvars import ContextVar
+from copy import deepcopy
 from functools import wraps
-from interactions import Absent, BaseContext, MISSING
+from interactions import Absent, BaseContext, Guild, Member, MISSING, Snowflake_Type, User, to_snowflake
+from json import dumps, loads
 from pathlib import Path
-from typing import Any, Awaitable, Callable, ParamSpec, TypeVar
-from yaml import safe_load
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Optional, ParamSpec, TypeVar
+from yaml import load as yaml_load
+from .aio import SingleFlightDeco, semaphore_gather
+from .cache import invalidator, language_cache
 from .constants import Config
+from .database import db_context
+from .environment import TRANSLATIONS_CACHE
 from .errors import UnsupportedLanguageError, UnsupportedTranslationTypeError
 from .misc import FormatStr, PrimitiveExtension
 from .utils.essentials import get_logger
 from .utils.general import get_language
+from .utils.profiling import startup_profiler
+
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml isn't available
+    from yaml import SafeLoader  # type: ignore
 
 
 logger = get_logger()
@@ -28,6 +47,101 @@ P = ParamSpec("P")
 
 
 language: ContextVar[str] = ContextVar("language")
+# the context the language got resolved for (one per invocation)
+_language_ctx: ContextVar[Optional[BaseContext]] = ContextVar("_language_ctx", default=None)
+
+# cached if no language is set
+_NO_LANGUAGE: object = object()
+
+
+def _get_language_key(
+    *, guild: Absent[Guild | Snowflake_Type] = MISSING, user: Absent[User | Member | Snowflake_Type] = MISSING
+) -> str:
+    if user is not MISSING:
+        return f"language:user:{to_snowflake(user)}"
+    return f"language:guild:{to_snowflake(guild)}"
+
+
+@SingleFlightDeco.by(lambda key, **kwargs: key)
+async def _fetch_language(key: str, **kwargs: Guild | User | Member | Snowflake_Type) -> Optional[str]:
+    generation = language_cache.generation
+    # the lookup gets its own session, any of the waiting callers may finish (and close theirs) in the meanwhile
+    async with db_context():
+        lan = await get_language(**kwargs)
+    language_cache.set(key, _NO_LANGUAGE if lan is None else lan, generation)
+    return lan
+
+
+async def _get_language(
+    *, guild: Absent[Guild | Snowflake_Type] = MISSING, user: Absent[User | Member | Snowflake_Type] = MISSING
+) -> Optional[str]:
+    key = _get_language_key(guild=guild, user=user)
+    if (lan := language_cache.get(key)) is MISSING:
+        return await _fetch_language(key, guild=guild, user=user)
+    return None if lan is _NO_LANGUAGE else lan
+
+
+async def resolve_language(
+    *, guild: Absent[Guild | Snowflake_Type] = MISSING, user: Absent[User | Member | Snowflake_Type] = MISSING
+) -> str:
+    """
+    Resolves the language to use, the language of the user has precedence over the one of the guild.
+    The set languages are cached in ``language_cache``.
+
+    Parameters
+    ----------
+    guild: Guild, SnowflakeType
+        The guild (if any).
+    user: User, Member, SnowflakeType
+        The user (if any).
+
+    Returns
+    -------
+    str
+        The language of the user, of the guild or ``Config.LANGUAGE_DEFAULT``.
+    """
+    # one after another, the languages may be loaded with the database session of the invocation,
+    # which doesn't allow concurrent operations (and the guild's language is only needed without a user's language)
+    if user is not MISSING and (lan := await _get_language(user=user)):
+        return lan
+    if guild is not MISSING and (lan := await _get_language(guild=guild)):
+        return lan
+    return Config.LANGUAGE_DEFAULT
+
+
+async def invalidate_language(
+    *, guild: Absent[Guild | Snowflake_Type] = MISSING, user: Absent[User | Member | Snowflake_Type] = MISSING
+) -> None:
+    """
+    Drops the cached language of a guild or a user (in every process). Has to be called after changing it.
+
+    Parameters
+    ----------
+    guild: Guild, SnowflakeType
+        The guild which changed its language.
+    user: User, Member, SnowflakeType
+        The user who changed their language.
+    """
+    await invalidator.invalidate(_get_language_key(guild=guild, user=user))
+
+
+async def prefetch_languages(users: Iterable[User | Member | Snowflake_Type], /, *, n: int = 10) -> None:
+    """
+    Caches the languages of multiple users at once.
+
+    Parameters
+    ----------
+    users: Iterable[User | Member | SnowflakeType]
+        The users.
+    n: int
+        The maximum amount of languages to fetch simultaneously.
+    """
+    keys: dict[str, Snowflake_Type] = {}
+    for user in users:
+        if (key := _get_language_key(user=user)) not in keys and language_cache.get(key) is MISSING:
+            keys[key] = to_snowflake(user)
+
+    await semaphore_gather(n, *(_fetch_language(key, user=user) for key, user in keys.items()))
 
 
 def language_wrapper(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
@@ -42,13 +156,10 @@ def language_wrapper(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T
                     ctx = arg
                     break
 
-        # set language if a Context could be found
-        if ctx is not MISSING:
-            language.set(
-                await get_language(user=ctx.author)
-                or (await get_language(guild=ctx.guild) if ctx.guild is not None else None)
-                or Config.LANGUAGE_DEFAULT
-            )
+        # set language if a Context could be found (only once per invocation, checks etc. share the context)
+        if ctx is not MISSING and _language_ctx.get() is not ctx:
+            language.set(await resolve_language(user=ctx.author, guild=ctx.guild if ctx.guild is not None else MISSING))
+            _language_ctx.set(ctx)
 
         return await func(*args, **kwargs)
 
@@ -80,51 +191,207 @@ def merge(base: dict, src: dict) -> dict:
     return base
 
 
-class TranslationDict(dict):
-    _fallback: dict
+def _is_json_safe(tree: Any) -> bool:
+    try:
+        return loads(dumps(tree)) == tree
+    except (TypeError, ValueError):
+        return False
+
+
+class _ParseCache:
+    """
+    Caches the parsed translation files on disk (as JSON), a file only gets parsed again if its mtime or size changed.
+    """
+
+    VERSION: int = 2
+
+    path: Optional[Path]
+    _entries: dict[str, tuple[int, int, dict]]
+    _loaded: bool
+    _dirty: bool
+
+    def __init__(self, path: Optional[Path]):
+        """
+        Parameters
+        ----------
+        path: Path, optional
+            The file to persist the cache in (``None`` keeps it in memory only).
+        """
+        self.path = path
+        self._entries = {}
+        self._loaded = False
+        self._dirty = False
+
+    def _load(self) -> None:
+        self._loaded = True
+        if self.path is None or not self.path.is_file():
+            return
+
+        try:
+            cache = loads(self.path.read_text("utf-8"))
+            if cache.get("version") == self.VERSION:
+                self._entries = {key: (mtime, size, tree) for key, (mtime, size, tree) in cache["entries"].items()}
+        except (OSError, ValueError, TypeError, AttributeError, KeyError) as e:
+            logger.warning(f"Unable to read the translation cache {str(self.path)!r}: {e!r}")
+
+    def get(self, file: Path) -> dict:
+        """
+        Parameters
+        ----------
+        file: Path
+            The translation file.
+
+        Returns
+        -------
+        dict
+            The parsed content of ``file`` (a copy, so it can be merged into).
+        """
+        if not self._loaded:
+            self._load()
+
+        stat = file.stat()
+        key = str(file.resolve())
+        if (entry := self._entries.get(key)) is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return deepcopy(entry[2])
+
+        logger.debug(f"Parsing {str(file)!r}")
+        with file.open(encoding="utf-8") as f:
+            tree = yaml_load(f, Loader=SafeLoader) or {}
+        self._entries[key] = stat.st_mtime_ns, stat.st_size, tree
+        self._dirty = True
+        return deepcopy(tree)
+
+    def is_outdated(self, file: Path) -> bool:
+        """
+        Parameters
+        ----------
+        file: Path
+            The translation file.
+
+        Returns
+        -------
+        bool
+            Whether ``file`` got created, changed or deleted since it was parsed the last time.
+        """
+        if not self._loaded:
+            self._load()
+
+        entry = self._entries.get(str(file.resolve()))
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            return entry is not None
+        return entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size)
+
+    def discard(self, file: Path) -> None:
+        if self._entries.pop(str(file.resolve()), None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """
+        Writes the cache to disk if anything got parsed since it was read.
+        """
+        if self.path is None or not self._dirty:
+            return
+
+        entries = {k: v for k, v in self._entries.items() if Path(k).is_file()}
+        # trees JSON can't represent as they are (e.g. non-string keys) are parsed again next time
+        stored = {k: v for k, v in entries.items() if _is_json_safe(v[2])}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.tmp")
+            tmp.write_text(dumps({"version": self.VERSION, "entries": stored}), "utf-8")
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Unable to write the translation cache {str(self.path)!r}: {e!r}")
+            return
+
+        self._entries = entries
+        self._dirty = False
+
+
+def _build_catalog(
+    tree: dict, catalog: dict[str, "TranslationDict | FormatStr"], prefix: str = ""
+) -> "TranslationDict":
+    """
+    Builds the ``TranslationDict`` for ``tree`` and adds every (nested) entry to ``catalog`` by its dotted key.
+    """
+    node = TranslationDict()
+    for k, v in tree.items():
+        key = f"{prefix}{k}"
+        value: TranslationDict | FormatStr
+
+        if isinstance(v, str):
+            value = FormatStr(v)
+        elif isinstance(v, dict):
+            value = _build_catalog(v, catalog, f"{key}.")
+        else:
+            raise UnsupportedTranslationTypeError(key=key, type=type(v), supported=[dict, str])
+
+        node[str(k)] = catalog[key] = value
+
+    return node
+
+
+def _compile_catalog(tree: dict, fallback: dict) -> Mapping[str, "TranslationDict | FormatStr"]:
+    if tree is not fallback:
+        tree = merge(deepcopy(fallback), tree)
+    _build_catalog(tree, flat := {})
+    return MappingProxyType(flat)
+
+
+def _get_changed_keys(old: Mapping[str, object], new: Mapping[str, object]) -> list[str]:
+    return sorted(
+        k
+        for k in old.keys() | new.keys()
+        if (o := old.get(k)) != (n := new.get(k))
+        and not (isinstance(o, TranslationDict) and isinstance(n, TranslationDict))
+    )
+
+
+class TranslationDict(dict[str, "TranslationDict | FormatStr"]):
+    """
+    A (sub)tree of a catalog, the fallback language is already merged in.
+    """
 
     def __call__(self, *args: object, **kwargs: object) -> str:
         cnt = kwargs.get("cnt", kwargs.get("count", None))
 
         # translation: FormatStr
         if cnt == 1:
-            translation = self.one
+            translation = self["one"]
         elif cnt == 0 and "zero" in self:  # optional
-            translation = self.zero
+            translation = self["zero"]
         else:
-            translation = self.many
+            translation = self["many"]
 
         return translation(*args, **kwargs)
 
     def __getattr__(self, item: str) -> "TranslationDict | FormatStr":
-        value: dict | str = self.get(item, self._fallback[item])
-        result: TranslationDict | FormatStr
-
-        if isinstance(value, str):
-            result = FormatStr(value)
-        elif isinstance(value, dict):
-            result = TranslationDict(value)
-            result._fallback = self._fallback[item]
-        else:
-            raise UnsupportedTranslationTypeError(key=item, type=type(value), supported=[dict, str])
-
-        return result
-
-    def __contains__(self, item: object) -> bool:
-        return super().__contains__(item) or self._fallback.__contains__(item)
+        try:
+            return self[item]
+        except KeyError:
+            raise AttributeError(item) from None
 
 
 class TranslationNamespace:
     _sources: list[Path]
     _translations: dict[str, dict[str, Any]]
+    _catalogs: dict[str, Mapping[str, TranslationDict | FormatStr]]
 
     def __init__(self):
         self._sources = []
         self._translations = {}
+        self._catalogs = {}
 
     def tn_add_source(self, source: Path) -> None:
         self._sources.append(source)
-        self._translations.clear()
+        self._catalogs.clear()
+
+        # the new source has the highest priority, so it can be merged into the already loaded languages
+        for lan, translations in self._translations.items():
+            if (path := source / f"{lan}.yml".lower()).exists():
+                merge(translations, _parse_cache.get(path))
 
     def tn_get_language(self, lan: str) -> dict[str, Any]:
         if lan not in Config.LANGUAGE_AVAILABLE:
@@ -132,41 +399,94 @@ class TranslationNamespace:
 
         if lan not in self._translations:
             logger.debug(f"Creating translations for {lan!r}")
-            self._translations[lan] = {}
-            for source in self._sources:
-                if not (path := source / f"{lan}.yml".lower()).exists():
-                    continue
-                with path.open() as file:
-                    merge(self._translations[lan], safe_load(file) or {})
+            self._translations[lan] = self._tn_load_language(lan)
 
         return self._translations[lan]
 
-    def tn_get_translation(self, key: str, lan: str = MISSING) -> dict | str:
+    def _tn_load_language(self, lan: str) -> dict[str, Any]:
+        translations: dict[str, Any] = {}
+        for source in self._sources:
+            if not (path := source / f"{lan}.yml".lower()).exists():
+                _parse_cache.discard(path)
+                continue
+            merge(translations, _parse_cache.get(path))
+        return translations
+
+    def tn_get_catalog(self, lan: str) -> Mapping[str, TranslationDict | FormatStr]:
+        """
+        Parameters
+        ----------
+        lan: str
+            The language.
+
+        Returns
+        -------
+        Mapping[str, TranslationDict | FormatStr]
+            Every translation by its dotted key, missing ones are taken from ``Config.LANGUAGE_FALLBACK``.
+        """
+        if (catalog := self._catalogs.get(lan)) is not None:
+            return catalog
+
+        logger.debug(f"Building catalog for {lan!r}")
+        catalog = _compile_catalog(self.tn_get_language(lan), self.tn_get_language(Config.LANGUAGE_FALLBACK))
+        self._catalogs[lan] = catalog
+        return catalog
+
+    def tn_reload(self) -> dict[str, list[str]]:
+        """
+        Reloads every loaded language of which a file got created, changed or deleted.
+        Only those files are parsed again, the languages and catalogs are swapped at once,
+        so translations which are already in use stay untouched.
+
+        Returns
+        -------
+        dict[str, list[str]]
+            The changed keys by reloaded language.
+        """
+        outdated: set[str] = {
+            lan
+            for lan in self._translations
+            if any(_parse_cache.is_outdated(source / f"{lan}.yml".lower()) for source in self._sources)
+        }
+        if not outdated:
+            return {}
+
+        translations = self._translations.copy()
+        for lan in outdated:
+            translations[lan] = self._tn_load_language(lan)
+
+        # every catalog contains the fallback language
+        rebuild = self._catalogs.keys() if Config.LANGUAGE_FALLBACK in outdated else outdated & self._catalogs.keys()
+        fallback = translations.get(Config.LANGUAGE_FALLBACK) or self._tn_load_language(Config.LANGUAGE_FALLBACK)
+        catalogs = self._catalogs.copy()
+        changed: dict[str, list[str]] = {lan: [] for lan in outdated}
+        for lan in rebuild:
+            catalogs[lan] = _compile_catalog(translations[lan], fallback)
+            changed[lan] = _get_changed_keys(self._catalogs[lan], catalogs[lan])
+
+        self._translations, self._catalogs = translations, catalogs
+        return changed
+
+    def tn_get_translation(self, key: str, lan: str = MISSING) -> TranslationDict | FormatStr:
+        """
+        Parameters
+        ----------
+        key: str
+            The dotted key of the translation (e.g. ``"error.permission"``).
+        lan: str
+            The language, defaults to the current ``language``.
+
+        Returns
+        -------
+        TranslationDict | FormatStr
+            The translation.
+        """
         if lan is MISSING:
             lan = language.get(Config.LANGUAGE_DEFAULT)
-        translations = self.tn_get_language(lan)
-
-        if key not in translations:
-            translations = self.tn_get_language(Config.LANGUAGE_FALLBACK)
-
-        if not isinstance(translation := translations[key], (dict, str)):
-            raise UnsupportedTranslationTypeError(key=key, type=type(translation))
-
-        return translation
+        return self.tn_get_catalog(lan)[key]
 
     def __getattr__(self, item: str) -> TranslationDict | FormatStr:
-        value: dict | str = self.tn_get_translation(item)
-        result: TranslationDict | FormatStr
-
-        if isinstance(value, str):
-            result = FormatStr(value)
-        elif isinstance(value, dict):
-            result = TranslationDict(value)
-            result._fallback = self.tn_get_language(Config.LANGUAGE_FALLBACK)[item]
-        else:
-            raise UnsupportedTranslationTypeError(key=item, type=type(value), supported=[dict, str])
-
-        return result
+        return self.tn_get_catalog(language.get(Config.LANGUAGE_DEFAULT))[item]
 
 
 class Translations:
@@ -186,6 +506,49 @@ class Translations:
 
         self._namespace[name].tn_add_source(file)
 
+    def build_catalogs(self) -> None:
+        """
+        Builds the catalogs of every namespace for every available language.
+        """
+        for namespace in self._namespace.values():
+            for lan in Config.LANGUAGE_AVAILABLE:
+                namespace.tn_get_catalog(lan)
+
+        _parse_cache.save()
+
+    def reload_translations(self) -> None:
+        """
+        Reloads the changed translation files of every namespace (see ``TranslationNamespace.tn_reload``).
+        """
+        for name in self._namespace:
+            self._reload_namespace(name)
+
+        _parse_cache.save()
+
+    def reload_translation_namespace(self, name: str, file: Path) -> None:
+        """
+        Reloads the changed translation files of one namespace, it's registered if it doesn't exist yet.
+
+        Parameters
+        ----------
+        name: str
+            The name of the namespace.
+        file: Path
+            The folder with the translation files of the namespace.
+        """
+        if name in self._namespace:
+            self._reload_namespace(name)
+        else:
+            self.register_translation_namespace(name, file)
+            for lan in Config.LANGUAGE_AVAILABLE:
+                self._namespace[name].tn_get_catalog(lan)
+
+        _parse_cache.save()
+
+    def _reload_namespace(self, name: str) -> None:
+        for lan, keys in self._namespace[name].tn_reload().items():
+            logger.info(f"Reloaded {lan!r} of {name!r}, changed keys: {', '.join(keys) or '-'}")
+
     def __getattr__(self, item: str) -> TranslationNamespace:
         return self._namespace[item]
 
@@ -197,7 +560,7 @@ def load_translations(
     translation_folder: str = "translations",
 ) -> None:
     """
-    Loads translations from the extensions.
+    Loads translations from the extensions and builds the catalogs.
 
     Parameters
     ----------
@@ -214,12 +577,41 @@ def load_translations(
     if extensions is MISSING:
         extensions = Config.EXTENSIONS
 
-    for ext in extensions:
-        if (path := ext.path.joinpath(translation_folder)).is_dir():
-            for lan in Config.LANGUAGE_AVAILABLE:
-                if (path.joinpath(f"{lan}.yml".lower())).is_file():
+    with startup_profiler.phase("translations"):
+        for ext in extensions:
+            if (path := ext.path.joinpath(translation_folder)).is_dir():
+                if any(path.joinpath(f"{lan}.yml".lower()).is_file() for lan in Config.LANGUAGE_AVAILABLE):
                     translations.register_translation_namespace(path.parent.name, path)
 
+        translations.build_catalogs()
+
+
+async def watch_translations(*, translations: Absent[Translations] = MISSING, interval: float = 1) -> None:
+    """
+    Polls the translation files and reloads the changed ones (runs until cancelled).
+
+    Parameters
+    ----------
+    translations: Translations
+        The translations to watch (defaults to ``translations.t``).
+    interval: float
+        The amount of seconds between two polls.
+    """
+    if translations is MISSING:
+        translations = t
+
+    logger.info(f"Watching translation files every {interval}s")
+    while True:
+        await sleep(interval)
+        try:
+            translations.reload_translations()
+        except Exception as e:
+            # e.g. a file got saved halfway, the next poll will try it again
+            logger.warning(f"Unable to reload translations: {e!r}")
+
+
+# parsed translation files of every namespace
+_parse_cache: _ParseCache = _ParseCache(Path(TRANSLATIONS_CACHE) if TRANSLATIONS_CACHE else None)
 
 # global translations container
 t: Translations = Translations()
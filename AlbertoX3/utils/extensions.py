@@ -1,6 +1,7 @@
 __all__ = (
     "get_extensions",
     "load_extensions",
+    "reload_extension",
     "check_extension_requirements",
     "get_subclasses_in_extensions",
 )
@@ -8,16 +9,28 @@ __all__ = (
 
 import re
 import sys
+from asyncio import Lock
+from concurrent.futures import ThreadPoolExecutor
+from graphlib import CycleError, TopologicalSorter
+from importlib import import_module, reload
 from interactions.client.client import Client
 from interactions.client.const import Absent
+from interactions.client.utils.input_utils import get_args, get_first_word
+from interactions.ext.prefixed_commands.command import PrefixedCommand
+from interactions.ext.prefixed_commands.context import PrefixedContext
+from json import dumps, loads
+from os import stat
 from pathlib import Path
-from typing import Iterable, cast, Literal, TypeVar
+from typing import Any, Iterable, Optional, cast, Literal, TypeVar
+from ..aio import run_in_thread
 from ..constants import Config, MISSING
-from ..errors import NoExtensionError, TooMayExtensionsError
+from ..environment import EXTENSIONS_MANIFEST
+from ..errors import ExtensionNotLoadedError, NoExtensionError, TooMayExtensionsError
 from ..ipy_wrapper import Extension
-from ..misc import EXTENSION_FEATURES, PrimitiveExtension
+from ..misc import EXTENSION_FEATURES, PrimitiveExtension, SubclassRegistry
 from .essentials import get_logger
-from .terminal import get_installed_libraries
+from .profiling import startup_profiler
+from .terminal import get_installed_libraries, normalize_library_name
 
 
 logger = get_logger()
@@ -25,14 +38,121 @@ T = TypeVar("T")
 C = TypeVar("C", bound=type[object])
 
 
-def get_extensions(folder: Absent[Path] = MISSING) -> set[PrimitiveExtension]:
-    if folder is MISSING:
-        folder = Config.EXTENSIONS_FOLDER
+# the loaded extensions by their full name
+_loaded: dict[str, PrimitiveExtension] = {}
+# the extensions unloaded by ``reload_extension`` as their requirements weren't met anymore (by their full name)
+_unsatisfied: dict[str, PrimitiveExtension] = {}
 
+
+class _Manifest:
+    """
+    Caches the discovered extensions of a folder (in memory and on disk).
+    The manifest is valid as long as the mtimes of the folder, the groups and the extensions didn't change,
+    since every added, removed or renamed file changes the mtime of its directory.
+    """
+
+    VERSION: int = 1
+
+    path: Optional[Path]
+    _folders: dict[str, dict[str, Any]]
+    _extensions: dict[str, set[PrimitiveExtension]]
+    _loaded: bool
+
+    def __init__(self, path: Optional[Path]):
+        """
+        Parameters
+        ----------
+        path: Path, optional
+            The file to persist the manifest in (``None`` keeps it in memory only).
+        """
+        self.path = path
+        self._folders = {}
+        self._extensions = {}
+        self._loaded = False
+
+    def _load(self) -> None:
+        self._loaded = True
+        if self.path is None or not self.path.is_file():
+            return
+
+        try:
+            manifest = loads(self.path.read_text("utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unable to read the extension manifest {str(self.path)!r}: {e!r}")
+            return
+
+        if manifest.get("version") == self.VERSION and manifest.get("features") == list(EXTENSION_FEATURES):
+            self._folders = manifest["folders"]
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+
+        manifest = {"version": self.VERSION, "features": list(EXTENSION_FEATURES), "folders": self._folders}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.tmp")
+            tmp.write_text(dumps(manifest, indent=2), "utf-8")
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Unable to write the extension manifest {str(self.path)!r}: {e!r}")
+
+    @staticmethod
+    def _is_valid(mtimes: dict[str, int]) -> bool:
+        try:
+            return all(stat(path).st_mtime_ns == mtime for path, mtime in mtimes.items())
+        except OSError:
+            return False
+
+    def get(self, folder: Path) -> set[PrimitiveExtension]:
+        """
+        Parameters
+        ----------
+        folder: Path
+            The folder with the groups of extensions.
+
+        Returns
+        -------
+        set[PrimitiveExtension]
+            The extensions in ``folder``.
+        """
+        if not self._loaded:
+            self._load()
+
+        key = str(folder.absolute())
+        if (entry := self._folders.get(key)) is not None and self._is_valid(entry["mtimes"]):
+            if (extensions := self._extensions.get(key)) is None:
+                self._extensions[key] = extensions = {
+                    PrimitiveExtension(
+                        folder=folder.name,
+                        group=group,
+                        name=name,
+                        path=folder.joinpath(group, name),
+                        has=[f for i, f in enumerate(EXTENSION_FEATURES) if features & (1 << i)],
+                    )
+                    for group, name, features in entry["extensions"]
+                }
+            return extensions.copy()
+
+        logger.debug(f"Discovering extensions in {key!r}")
+        mtimes, extensions = _discover_extensions(folder)
+        self._folders[key] = {
+            "mtimes": mtimes,
+            "extensions": sorted([ext.group, ext.name, ext.features] for ext in extensions),
+        }
+        self._extensions[key] = extensions
+        self._save()
+        return extensions.copy()
+
+
+def _discover_extensions(folder: Path) -> tuple[dict[str, int], set[PrimitiveExtension]]:
+    mtimes: dict[str, int] = {str(folder.absolute()): folder.stat().st_mtime_ns}
     extensions: set[PrimitiveExtension] = set()
 
     for group in filter(Path.is_dir, folder.iterdir()):
+        mtimes[str(group.absolute())] = group.stat().st_mtime_ns
         for ext in filter(Path.is_dir, group.iterdir()):
+            mtimes[str(ext.absolute())] = ext.stat().st_mtime_ns
             py_files = [e.name.removesuffix(".py") for e in ext.iterdir() if e.is_file() and e.name.endswith(".py")]
             if "ext" not in py_files:
                 # isn't a valid extension
@@ -45,19 +165,150 @@ def get_extensions(folder: Absent[Path] = MISSING) -> set[PrimitiveExtension]:
                 )
             )
 
-    return extensions
+    return mtimes, extensions
+
+
+# the discovered extensions
+_manifest: _Manifest = _Manifest(Path(EXTENSIONS_MANIFEST) if EXTENSIONS_MANIFEST else None)
+
+
+def get_extensions(folder: Absent[Path] = MISSING) -> set[PrimitiveExtension]:
+    """
+    Gets the extensions in a folder. The result is cached as long as nothing in the folder changes.
+
+    Parameters
+    ----------
+    folder: Path
+        The folder with the groups of extensions (defaults to ``Config.EXTENSIONS_FOLDER``).
+
+    Returns
+    -------
+    set[PrimitiveExtension]
+        The extensions.
+    """
+    if folder is MISSING:
+        folder = Config.EXTENSIONS_FOLDER
+
+    return _manifest.get(folder)
+
+
+class _LazyExtension:
+    """
+    Registers lightweight stubs for the prefixed commands declared in the ``lazy.py`` of an extension.
+    The extension itself is imported and loaded on the first invocation of one of them,
+    the stubs are then replaced by the real commands and the invocation is passed on.
+    """
+
+    bot: Client
+    extension: PrimitiveExtension
+    stubs: list[PrefixedCommand]
+    enabled: Optional[bool]
+    """Whether the extension got loaded, ``None`` until the first invocation"""
+    _lock: Lock
+
+    def __init__(self, bot: Client, extension: PrimitiveExtension):
+        """
+        Parameters
+        ----------
+        bot: Client
+            The bot to register the stubs for (prefixed commands have to be set up).
+        extension: PrimitiveExtension
+            The lazy extension.
+        """
+        self.bot = bot
+        self.extension = extension
+        self.stubs = []
+        self.enabled = None
+        self._lock = Lock()
+
+        commands: dict[str, list[str]] = import_module(f"{extension.package}.lazy").COMMANDS
+        for name, aliases in commands.items():
+            stub = PrefixedCommand(name=name, aliases=list(aliases), callback=self._invoke)
+            self.bot.prefixed.add_command(stub)  # type: ignore
+            self.stubs.append(stub)
+
+    async def _load(self) -> bool:
+        async with self._lock:
+            if self.enabled is None:
+                # imported in a thread, so a heavy extension doesn't block the event loop
+                await run_in_thread(_import_extension, self.extension)
+                self.enabled = self.extension in check_extension_requirements([*_loaded.values(), self.extension])
+
+                for stub in self.stubs:
+                    self.bot.prefixed.remove_command(stub.name)  # type: ignore
+
+                if self.enabled:
+                    logger.info(f"Loading lazy extension {self.extension.full_name!r}")
+                    self.bot.load_extension(name=f"{self.extension.package}.ext")
+                    _loaded[self.extension.full_name] = self.extension
+                    self._check_stubs()
+                else:
+                    logger.warning(f"Lazy extension {self.extension.full_name!r} doesn't meet its requirements")
+
+            return self.enabled
+
+    def _check_stubs(self) -> None:
+        # ``COMMANDS`` in ``lazy.py`` has to be kept in sync with the commands of the extension by hand
+        for stub in self.stubs:
+            if (command := self.bot.prefixed.get_command(stub.name)) is None:  # type: ignore
+                logger.warning(
+                    f"Lazy extension {self.extension.full_name!r} declares the command {stub.name!r} in its lazy.py, "
+                    f"but doesn't define it"
+                )
+            elif missing := [alias for alias in stub.aliases if alias not in command.aliases]:
+                logger.warning(
+                    f"Lazy extension {self.extension.full_name!r} declares the aliases {missing!r} of the command "
+                    f"{stub.name!r} in its lazy.py, but doesn't define them"
+                )
+
+    async def _invoke(self, ctx: PrefixedContext) -> None:
+        stub = ctx.command
+        if not await self._load():
+            logger.warning(
+                f"Ignoring the command {stub.name!r}, the lazy extension {self.extension.full_name!r} is disabled"
+            )
+            return
+        if (command := self.bot.prefixed.get_command(stub.name)) is None:  # type: ignore
+            logger.warning(
+                f"Ignoring the command {stub.name!r}, "
+                f"the lazy extension {self.extension.full_name!r} doesn't define it (check its lazy.py)"
+            )
+            return
+
+        # resolve subcommands the same way the prefixed commands manager does
+        content_parameters = ctx.content_parameters
+        while (sub := command.subcommands.get(word := get_first_word(content_parameters))) and sub.enabled:
+            command = sub
+            content_parameters = content_parameters.removeprefix(word).strip()
+
+        ctx.command = command
+        ctx.content_parameters = content_parameters
+        ctx.args = get_args(content_parameters)
+        await command(ctx)
 
 
 def load_extensions(bot: Client, extensions: Absent[Iterable[PrimitiveExtension]] = MISSING) -> None:
     if extensions is MISSING:
         extensions = get_extensions()
 
-    # get enabled extensions
-    enabled = check_extension_requirements(extensions)
+    # lazy extensions are only loaded on first use of one of their commands
+    lazy = [ext for ext in extensions if ext.has_lazy]  # type: ignore
+    extensions = [ext for ext in extensions if not ext.has_lazy]  # type: ignore
 
-    for extension in enabled:
-        logger.info(f"Loading extension {extension.full_name!r}")
-        bot.load_extension(name=f"{extension.package}.ext")
+    # get enabled extensions (in the order to load them)
+    with startup_profiler.phase("extensions.requirements"):
+        enabled = check_extension_requirements(extensions)
+
+    with startup_profiler.phase("extensions.load"):
+        for extension in enabled:
+            logger.info(f"Loading extension {extension.full_name!r}")
+            bot.load_extension(name=f"{extension.package}.ext")
+            _loaded[extension.full_name] = extension
+
+    with startup_profiler.phase("extensions.lazy"):
+        for extension in lazy:
+            logger.info(f"Registering lazy extension {extension.full_name!r}")
+            _LazyExtension(bot, extension)
 
     skipped = {ext for ext in extensions if ext not in enabled}
     if skipped:
@@ -67,7 +318,128 @@ def load_extensions(bot: Client, extensions: Absent[Iterable[PrimitiveExtension]
 _LIB_REGEX: re.Pattern[str] = re.compile(r"^([a-zA-Z][\w-]*)(?:([=!><~])=(\d[\d.]*))?$")
 
 
-def check_extension_requirements(extensions: Absent[Iterable[PrimitiveExtension]] = MISSING) -> set[PrimitiveExtension]:
+def _unload_extension(bot: Client, extension: PrimitiveExtension) -> list[Extension]:
+    """
+    Unloads ``extension`` and returns its instances.
+    """
+    module = f"{extension.package}.ext"
+    instances: list[Extension] = bot.get_extensions(module)  # type: ignore
+    bot.unload_extension(module)
+
+    # the prefixed commands would only be removed by a listener later on, which would then remove the commands of
+    # a reloaded extension (it removes them by the module name), so they are removed right now instead
+    if (prefixed := getattr(bot, "prefixed", None)) is not None:
+        for name in prefixed._ext_command_list.pop(module, set()):  # noqa
+            prefixed.remove_command(name)
+        for instance in instances:
+            instance.extension_name = f"{module}:unloaded"
+
+    _loaded.pop(extension.full_name, None)
+    return instances
+
+
+def reload_extension(bot: Client, extension: PrimitiveExtension) -> None:
+    """
+    Reloads a loaded extension without restarting the bot.
+
+    The modules of the extension are imported again, the old instance is replaced by a new one
+    (invocations which already started finish on the old instance) and gets its state passed
+    (see ``Extension.export_state``). The translations of the extension are reloaded
+    (invalid files are logged and the previous translations kept) and every extension which depends on it is unloaded if its requirements aren't met anymore.
+    Extensions unloaded that way (including the reloaded one) are loaded again by a later reload
+    as soon as their requirements are met.
+
+    Notes
+    -----
+    Database models (``db.py``) aren't reloaded, changing them still needs a restart.
+
+    Parameters
+    ----------
+    bot: Client
+        The bot the extension is loaded into.
+    extension: PrimitiveExtension
+        The extension to reload.
+
+    Raises
+    ------
+    ExtensionNotLoadedError
+        If the extension isn't loaded (and wasn't unloaded by a reload).
+    """
+    # due to circular imports
+    from ..translations import t
+
+    if extension.full_name not in _loaded and extension.full_name not in _unsatisfied:
+        raise ExtensionNotLoadedError(extension)
+    name = f"{extension.package}.ext"
+    was_loaded = extension.full_name in _loaded
+
+    # if anything fails in here, the old extension simply stays loaded
+    logger.info(f"Reloading extension {extension.full_name!r}")
+    # the reloaded modules register their classes again, removed or renamed ones mustn't stay
+    cleared = [(registry, registry.clear(extension.package)) for registry in SubclassRegistry.registries()]
+    try:
+        for other in sorted(m for m in sys.modules if m.startswith(f"{extension.package}.")):
+            if other not in {name, f"{extension.package}.db"}:
+                reload(sys.modules[other])
+        if (module := sys.modules.get(name)) is not None:
+            reload(module)
+        else:
+            # got unloaded by an earlier reload
+            module = import_module(name)
+    except BaseException:
+        for registry, classes in cleared:
+            registry.restore(extension.package, classes)
+        raise
+
+    _unsatisfied.pop(extension.full_name, None)
+    enabled = check_extension_requirements({**_loaded, **_unsatisfied, extension.full_name: extension}.values())
+
+    state = {}
+    if was_loaded:
+        state = {instance.name: instance.export_state() for instance in _unload_extension(bot, extension)}
+    if extension in enabled:
+        # the module got reloaded already, so it's put back to not execute it again
+        sys.modules[name] = module
+        bot.load_extension(name)
+        _loaded[extension.full_name] = extension
+        for instance in bot.get_extensions(name):
+            instance.import_state(state.get(instance.name, {}))  # type: ignore
+    else:
+        logger.warning(f"Extension {extension.full_name!r} doesn't meet its requirements anymore")
+        _unsatisfied[extension.full_name] = extension
+
+    if (path := extension.path.joinpath("translations")).is_dir():
+        try:
+            t.reload_translation_namespace(extension.name, path)
+        except Exception as e:
+            # the extension is swapped already, so the dependents have to be updated regardless
+            logger.warning(f"Unable to reload the translations of {extension.full_name!r}, keeping the old ones: {e!r}")
+
+    # extensions depending on the reloaded one may not be satisfied anymore
+    for other in [ext for ext in _loaded.values() if ext not in enabled]:
+        logger.warning(f"Unloading extension {other.full_name!r}, its requirements aren't met anymore")
+        _unload_extension(bot, other)
+        _unsatisfied[other.full_name] = other
+
+    # ... or they may be satisfied again (in the order to load them)
+    for other in [ext for ext in enabled if ext.full_name in _unsatisfied]:
+        logger.info(f"Loading extension {other.full_name!r} again, its requirements are met")
+        bot.load_extension(f"{other.package}.ext")
+        _loaded[other.full_name] = _unsatisfied.pop(other.full_name)
+
+
+def _import_extension(extension: PrimitiveExtension) -> Optional[BaseException]:
+    try:
+        with startup_profiler.extension_import(extension.full_name):
+            import_module(f"{extension.package}.ext")
+    except BaseException as e:  # something is wrong with the extension... missing imports? syntax errors?
+        return e
+    return None
+
+
+def check_extension_requirements(
+    extensions: Absent[Iterable[PrimitiveExtension]] = MISSING, *, workers: Optional[int] = None
+) -> list[PrimitiveExtension]:
     """
     Checks all requirements listed in ``Extension.requirements``
 
@@ -75,11 +447,13 @@ def check_extension_requirements(extensions: Absent[Iterable[PrimitiveExtension]
     ----------
     extensions: Absent[Iterable[PrimitiveExtension]]
         All extensions to check among each other.
+    workers: int, optional
+        The maximum amount of extensions to import simultaneously. Defaults to ``ThreadPoolExecutor``'s default.
 
     Returns
     -------
-    set[PrimitiveExtension]
-        All extensions with met requirements (and are enabled).
+    list[PrimitiveExtension]
+        All extensions with met requirements (and are enabled) in the order to load them (dependencies first).
     """
     # WARNING: don't read this code! It's a mess, and it works (somehow).
     #          Touching this function might end up destroying the whole startup of the bot!
@@ -89,22 +463,28 @@ def check_extension_requirements(extensions: Absent[Iterable[PrimitiveExtension]
 
     if extensions is MISSING:
         extensions = get_extensions()
+    extensions = list(extensions)
 
     ext_classes: set[tuple[PrimitiveExtension, type[Extension]]] = set()
     disabled: set[PrimitiveExtension] = set()
     required_by: dict[str, list[tuple[PrimitiveExtension, type[Extension]]]] = {}
-    libraries: dict[str, str] = get_installed_libraries()
+    with startup_profiler.phase("extensions.libraries"):
+        libraries: dict[str, str] = get_installed_libraries()
     lib: str
     mode: Literal["=", "!", ">", "<", "~"] | None
     ver: str | None
     l_ver: str
 
+    # the extensions don't depend on each other while being imported, so they can be imported simultaneously
+    with startup_profiler.phase("extensions.imports"), ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="AlbertoX3-import"
+    ) as executor:
+        errors = list(executor.map(_import_extension, extensions))
+
     # get all (by default) disabled extensions (and fill in ext_classes)
-    for extension in extensions:
-        try:
-            __import__(f"{extension.package}.ext")
-        except BaseException:  # noqa: F841  # something is wrong with the extension... missing imports? syntax errors?
-            logger.warning(f"Something unexpected happened during loading {extension.package!r}")
+    for extension, error in zip(extensions, errors):
+        if error is not None:
+            logger.warning(f"Something unexpected happened during loading {extension.package!r}: {error!r}")
             disabled.add(extension)
         else:
             ext_cls = get_subclasses_in_extensions(base=Extension, extensions=[extension])
@@ -118,7 +498,7 @@ def check_extension_requirements(extensions: Absent[Iterable[PrimitiveExtension]
                     else:
                         for req in cls.requires["lib"]:
                             lib, mode, ver = cast(re.Match[str], _LIB_REGEX.match(req)).groups()  # type: ignore
-                            if (l_ver := libraries.get(lib, MISSING)) is MISSING:
+                            if (l_ver := libraries.get(normalize_library_name(lib), MISSING)) is MISSING:
                                 disabled.add(extension)
                             if ver is not None and match_version(ver, f"{mode}=", l_ver):  # type: ignore
                                 disabled.add(extension)
@@ -126,10 +506,25 @@ def check_extension_requirements(extensions: Absent[Iterable[PrimitiveExtension]
                     raise TooMayExtensionsError(extension)
 
     # get all dependencies
+    graph: dict[str, set[str]] = {}
     for ext in ext_classes:
+        graph[ext[0].full_name] = set(ext[1].requires["ext"])
         for dep in ext[1].requires["ext"]:
             required_by.setdefault(dep, []).append(ext)
 
+    # extensions depending on each other circularly can't be loaded
+    while True:
+        try:
+            TopologicalSorter(graph).prepare()
+        except CycleError as e:
+            cycle: list[str] = e.args[1]
+            logger.warning(f"Following extensions depend on each other circularly: {' -> '.join(cycle)}")
+            for name in cycle:
+                graph.pop(name, None)
+            disabled.update(ext for ext, _ in ext_classes if ext.full_name in cycle)
+        else:
+            break
+
     ext_names = [ext[0].full_name for ext in ext_classes]
     dis_names = [ext.full_name for ext in disabled]
     unsatisfied: list[str] = [dep for dep in required_by if dep not in ext_names or dep in dis_names]
@@ -145,7 +540,9 @@ def check_extension_requirements(extensions: Absent[Iterable[PrimitiveExtension]
             dis_names.append(ext.full_name)
             unsatisfied.append(ext.full_name)
 
-    return {ext[0] for ext in ext_classes} - disabled
+    # dependencies first
+    enabled = {ext[0].full_name: ext[0] for ext in ext_classes if ext[0] not in disabled}
+    return [enabled[name] for name in TopologicalSorter(graph).static_order() if name in enabled]
 
 
 def match_version(v1: str, mode: Literal["==", "!=", ">=", "<=", "~="], v2: str) -> bool:
@@ -194,6 +591,16 @@ def get_subclasses_in_extensions(base: C, *, extensions: Absent[Iterable[Primiti
     if extensions is MISSING:
         extensions = Config.EXTENSIONS
 
+    if (registry := SubclassRegistry.of(base)) is not None:
+        return [cls for package in dict.fromkeys(ext.package for ext in extensions) for cls in registry.get(package)]
+
     packages: set[str] = {ext.package for ext in extensions}
 
-    return [cls for cls in base.__subclasses__() if sys.modules[cls.__module__].__package__ in packages]
+    # only the current classes, not the ones from before an extension got reloaded
+    return [
+        cls
+        for cls in base.__subclasses__()
+        if (module := sys.modules.get(cls.__module__)) is not None
+        and module.__package__ in packages
+        and getattr(module, cls.__name__, None) is cls
+    ]
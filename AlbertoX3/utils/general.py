@@ -12,9 +12,10 @@ from interactions.models.discord.guild import Guild
 from interactions.models.discord.snowflake import Snowflake_Type
 from interactions.models.discord.user import Member, User
 from pprint import pformat
-from typing import Optional
+from typing import Optional, cast
 from ..constants import MISSING, StyleConfig
 from ..errors import DeveloperArgumentError
+from ..misc import SubclassRegistry
 from ..permission import BasePermission
 
 
@@ -94,7 +95,9 @@ def get_value_table(obj: object, /, *, style: Absent[dict[str, str] | StyleConfi
 
 def get_permissions() -> list[BasePermission]:
     permissions: list[BasePermission] = []
-    for bp_cls in BasePermission.__subclasses__():
+    # every permission enum registers itself (see ``BasePermission.__init_subclass__``)
+    registry = cast(SubclassRegistry, SubclassRegistry.of(BasePermission))
+    for bp_cls in registry.all():
         permissions.extend(list(bp_cls))
     return permissions
 
@@ -1,45 +1,377 @@
 __all__ = (
     "get_member",
+    "get_members",
     "get_user",
+    "setup_name_indexes",
 )
 
 
 import re
+import sys
+from interactions.api.events.discord import GuildLeft, MemberAdd, MemberRemove, MemberUpdate
+from interactions.client.client import Client
+from interactions.client.smart_cache import GlobalCache
+from interactions.models.discord.guild import Guild
 from interactions.models.discord.snowflake import Snowflake_Type
 from interactions.models.discord.user import Member, User
 from interactions.models.internal.context import BaseContext
-from typing import Optional
+from interactions.models.internal.listener import Listener
+from typing import Any, Callable, Iterable, Iterator, Optional
+from ..aio import SingleFlightDeco, semaphore_map
+from ..cache import LocalCache
 
 
 _ID_REGEX: re.Pattern[str] = re.compile(r"^([1-9]\d{6,19})$")
 _MENTION_REGEX: re.Pattern[str] = re.compile(r"^<@!?([1-9]\d{6,19})>$")
 _NAME_REGEX: re.Pattern[str] = re.compile(r"^(.{2,32})#(\d{4})$")
+_NOT_FOUND_TTL: float = 30
+_NOT_FOUND_SIZE: int = 4096
 
 
-async def get_member(ctx: BaseContext, raw: User | Member | Snowflake_Type) -> Optional[Member]:
+# IDs which couldn't be fetched recently
+_not_found: LocalCache = LocalCache(maxsize=_NOT_FOUND_SIZE, ttl=_NOT_FOUND_TTL)
+
+
+@SingleFlightDeco.by(lambda bot, guild_id, user_id: (guild_id, user_id))
+async def _fetch_member_coalesced(bot: Client, guild_id: int, user_id: int) -> Optional[Member]:
+    if (member := await bot.fetch_member(user_id, guild_id)) is None:
+        _not_found.set(f"member:{guild_id}:{user_id}", True)
+    return member
+
+
+async def _fetch_member(bot: Client, guild_id: Snowflake_Type, user_id: Snowflake_Type) -> Optional[Member]:
     """
-    Get a member from the context's guild.
+    Like ``Client.fetch_member``, but concurrent fetches of the same member share one request
+    and members which couldn't be found are remembered for a short time.
+    """
+    if f"member:{int(guild_id)}:{int(user_id)}" in _not_found:
+        return None
+    return await _fetch_member_coalesced(bot, int(guild_id), int(user_id))
+
+
+@SingleFlightDeco.by(lambda bot, user_id: user_id)
+async def _fetch_user_coalesced(bot: Client, user_id: int) -> Optional[User]:
+    if (user := await bot.fetch_user(user_id)) is None:
+        _not_found.set(f"user:{user_id}", True)
+    return user
+
+
+async def _fetch_user(bot: Client, user_id: Snowflake_Type) -> Optional[User]:
+    """
+    Like ``Client.fetch_user``, but concurrent fetches of the same user share one request
+    and users which couldn't be found are remembered for a short time.
+    """
+    if f"user:{int(user_id)}" in _not_found:
+        return None
+    return await _fetch_user_coalesced(bot, int(user_id))
+
+
+class _GuildNameIndex:
+    """
+    Case-folded usernames, nicknames and tags (``username#discriminator``) of the members of one guild.
+    """
+
+    __slots__ = ("tags", "usernames", "nicknames", "_names")
+
+    tags: dict[str, set[int]]
+    usernames: dict[str, set[int]]
+    nicknames: dict[str, set[int]]
+    _names: dict[int, tuple[str, str, Optional[str]]]
+
+    def __init__(self, members: Iterator[Member]):
+        self.tags = {}
+        self.usernames = {}
+        self.nicknames = {}
+        self._names = {}
+        for member in members:
+            self.add(member)
+
+    def add(self, member: Member) -> None:
+        self.remove(int(member.id))
+        username = member.username.casefold()
+        nickname = member.nickname.casefold() if member.nickname else None
+        tag = f"{username}#{member.discriminator}"
+
+        self._names[int(member.id)] = tag, username, nickname
+        self.tags.setdefault(tag, set()).add(int(member.id))
+        self.usernames.setdefault(username, set()).add(int(member.id))
+        if nickname is not None:
+            self.nicknames.setdefault(nickname, set()).add(int(member.id))
+
+    def remove(self, member_id: int) -> None:
+        if (names := self._names.pop(member_id, None)) is None:
+            return
+        for index, name in zip((self.tags, self.usernames, self.nicknames), names):
+            if name is not None and (ids := index.get(name)) is not None:
+                ids.discard(member_id)
+                if not ids:
+                    del index[name]
+
+
+class _MemberNameIndex:
+    """
+    Per-guild name indexes for ``get_member``.
+
+    A guild is indexed on its first lookup after it has been chunked (completely cached)
+    and kept up to date by member add/update/remove events (see ``setup_name_indexes``).
+    """
+
+    active: bool
+    _guilds: dict[int, _GuildNameIndex]
+
+    def __init__(self):
+        self.active = False
+        self._guilds = {}
+
+    def get(self, guild: Guild) -> Optional[_GuildNameIndex]:
+        if not self.active or not guild.chunked.is_set():
+            # the members of the guild aren't completely cached (yet/anymore)
+            self._guilds.pop(int(guild.id), None)
+            return None
+        if (index := self._guilds.get(int(guild.id))) is None:
+            index = self._guilds[int(guild.id)] = _GuildNameIndex(iter(guild.members))
+        return index
+
+    async def on_member_add(self, event: MemberAdd) -> None:
+        _not_found.invalidate(f"member:{int(event.guild_id)}:{int(event.member.id)}")
+        if (index := self._guilds.get(int(event.guild_id))) is not None:
+            index.add(event.member)
+
+    async def on_member_update(self, event: MemberUpdate) -> None:
+        if (index := self._guilds.get(int(event.guild_id))) is not None:
+            index.add(event.after)
+
+    async def on_member_remove(self, event: MemberRemove) -> None:
+        if (index := self._guilds.get(int(event.guild_id))) is not None:
+            index.remove(int(event.member.id))
+
+    async def on_guild_left(self, event: GuildLeft) -> None:
+        self._guilds.pop(int(event.guild_id), None)
+
+
+_member_name_index: _MemberNameIndex = _MemberNameIndex()
+
+
+class _UserNameIndex:
+    """
+    Case-folded usernames and tags (``username#discriminator``) of every cached user for ``get_user``.
+
+    The names are interned and map to the IDs only, so the index stays small.
+    Inserts are tracked by ``_IndexedGlobalCache``, evicted users are pruned on lookup or once the index got too big.
+    """
+
+    active: bool
+    tags: dict[str, tuple[int, ...]]
+    usernames: dict[str, tuple[int, ...]]
+    _names: dict[int, tuple[str, str]]
+
+    def __init__(self):
+        self.active = False
+        self.tags = {}
+        self.usernames = {}
+        self._names = {}
+
+    def add(self, user: User) -> None:
+        username = sys.intern(user.username.casefold())
+        if self._names.get(user_id := int(user.id)) == (username, user.discriminator):
+            return
+
+        self.remove(user_id)
+        self._names[user_id] = username, user.discriminator
+        tag = sys.intern(f"{username}#{user.discriminator}")
+        self.tags[tag] = self.tags.get(tag, ()) + (user_id,)
+        self.usernames[username] = self.usernames.get(username, ()) + (user_id,)
+
+    def remove(self, user_id: int) -> None:
+        if (names := self._names.pop(user_id, None)) is None:
+            return
+        username, discriminator = names
+        for index, name in ((self.tags, f"{username}#{discriminator}"), (self.usernames, username)):
+            if ids := tuple(i for i in index.get(name, ()) if i != user_id):
+                index[name] = ids
+            else:
+                index.pop(name, None)
+
+    def sweep(self, user_cache: dict) -> None:
+        """
+        Removes every user, which isn't cached anymore.
+        """
+        for user_id in [user_id for user_id in self._names if user_id not in user_cache]:
+            self.remove(user_id)
+
+    def candidates(self, ids: tuple[int, ...], user_cache: dict) -> Iterator[User]:
+        for user_id in ids:
+            if (user := user_cache.get(user_id)) is None:
+                # evicted from the cache
+                self.remove(user_id)
+            else:
+                yield user
+
+
+_user_name_index: _UserNameIndex = _UserNameIndex()
+
+
+class _IndexedGlobalCache(GlobalCache):
+    """
+    Keeps ``_user_name_index`` in sync with the user cache.
+    """
+
+    __slots__ = ()  # same layout as GlobalCache, so an existing cache can become an _IndexedGlobalCache
+
+    def place_user_data(self, data: Any) -> User:
+        user = super().place_user_data(data)
+        _user_name_index.add(user)
+        if len(_user_name_index._names) > 2 * len(self.user_cache) + 1024:
+            _user_name_index.sweep(self.user_cache)
+        return user
+
+    def delete_user(self, user_id: Snowflake_Type) -> None:
+        super().delete_user(user_id)
+        _user_name_index.remove(int(user_id))
+
+
+def setup_name_indexes(bot: Client) -> None:
+    """
+    Registers the listeners and the cache keeping the name indexes used by ``get_member`` and ``get_user`` up to date.
+    Without them ``get_member`` and ``get_user`` scan the cached members/users for every name.
 
     Parameters
     ----------
-    ctx: BaseContext
-    raw: Member, User, Snowflake_Type
-        The member to find.
+    bot: Client
+        The bot to register the listeners on.
+    """
+    for event, callback in (
+        ("member_add", _member_name_index.on_member_add),
+        ("member_update", _member_name_index.on_member_update),
+        ("member_remove", _member_name_index.on_member_remove),
+        ("guild_left", _member_name_index.on_guild_left),
+    ):
+        bot.add_listener(Listener.create(event)(callback))
+    _member_name_index.active = True
+
+    bot.cache.__class__ = _IndexedGlobalCache
+    for user in list(bot.cache.user_cache.values()):
+        _user_name_index.add(user)
+    _user_name_index.active = True
+
+
+def _find_member_by_name(ctx: BaseContext, raw: str) -> Optional[Member]:
+    if (index := _member_name_index.get(ctx.guild)) is None:
+        return _scan_members_by_name(ctx, raw)
 
+    def candidates(ids: Optional[set[int]]) -> Iterator[Member]:
+        for member_id in sorted(ids or ()):
+            if (member := ctx.bot.cache.get_member(ctx.guild_id, member_id)) is not None:
+                yield member
+
+    # same precedence as the scan: name#discriminator, name, nick; first case-sensitive, then lower case
+    result = _NAME_REGEX.match(raw)
+    for converter in (str, str.lower):
+        converted = converter(raw)
+        if result is not None:
+            name, discriminator = result.groups()
+            for member in candidates(index.tags.get(f"{name.casefold()}#{discriminator}")):
+                if converter(member.username) == converter(name) and member.discriminator == discriminator:
+                    return member
+        for member in candidates(index.usernames.get(raw.casefold())):
+            if converter(member.username) == converted:
+                return member
+        for member in candidates(index.nicknames.get(raw.casefold())):
+            if member.nickname and converter(member.nickname) == converted:
+                return member
+
+    return None
+
+
+def _scan_members_by_name(ctx: BaseContext, raw: str) -> Optional[Member]:
+    converter: Callable[[str], str]
+
+    # try name.lower if name doesn't match
+    for converter in (str, str.lower):
+        raw = converter(raw)
+
+        # name#discriminator?
+        if (result := _NAME_REGEX.match(raw)) is not None:
+            name, discriminator = result.groups()
+            for member in ctx.guild.members:
+                if converter(member.username) == name and member.discriminator == discriminator:
+                    return member
+
+        # name?
+        for member in ctx.guild.members:
+            if converter(member.username) == raw:
+                return member
+
+        # nick?
+        for member in ctx.guild.members:
+            if member.nickname and converter(member.nickname) == raw:
+                return member
+
+    return None
+
+
+def _find_user_by_name(ctx: BaseContext, raw: str) -> Optional[User]:
+    if not _user_name_index.active:
+        return _scan_users_by_name(ctx, raw)
+
+    user_cache = ctx.bot.cache.user_cache
+
+    # same precedence as the scan: name#discriminator, name; first case-sensitive, then lower case
+    result = _NAME_REGEX.match(raw)
+    for converter in (str, str.lower):
+        converted = converter(raw)
+        if result is not None:
+            name, discriminator = result.groups()
+            ids = _user_name_index.tags.get(f"{name.casefold()}#{discriminator}", ())
+            for user in _user_name_index.candidates(ids, user_cache):
+                if converter(user.username) == converter(name) and user.discriminator == discriminator:
+                    return user
+        ids = _user_name_index.usernames.get(raw.casefold(), ())
+        for user in _user_name_index.candidates(ids, user_cache):
+            if converter(user.username) == converted:
+                return user
+
+    return None
+
+
+def _scan_users_by_name(ctx: BaseContext, raw: str) -> Optional[User]:
+    converter: Callable[[str], str]
+
+    # try name.lower if name doesn't match
+    for converter in (str, str.lower):
+        raw = converter(raw)
+
+        # name#discriminator?
+        if (result := _NAME_REGEX.match(raw)) is not None:
+            name, discriminator = result.groups()
+            for user in ctx.bot.cache.user_cache.values():
+                if converter(user.username) == name and user.discriminator == discriminator:
+                    return user
+
+        # name?
+        for user in ctx.bot.cache.user_cache.values():
+            if converter(user.username) == raw:
+                return user
+
+    return None
+
+
+def _parse_member(raw: User | Member | Snowflake_Type) -> Member | int | str | None:
+    """
     Returns
     -------
-    Member, optional
-        The found member.
+    Member, int, str, optional
+        The member itself if a member was passed, the ID if an ID could be found, otherwise the name to look for.
     """
     match raw:
         case Member():
             return raw
 
         case User():
-            return await ctx.bot.fetch_member(ctx.guild_id, raw.id)
+            return int(raw.id)
 
         case _ if _ID_REGEX.match(str(raw)) is not None:  # also covers int() via regex
-            return await ctx.bot.fetch_member(ctx.guild_id, int(raw))
+            return int(raw)
 
         case int():
             # only invalid id's get here
@@ -48,37 +380,95 @@ async def get_member(ctx: BaseContext, raw: User | Member | Snowflake_Type) -> O
         case str():
             # mention?
             if (result := _MENTION_REGEX.match(raw)) is not None:
-                return await ctx.bot.fetch_member(ctx.guild_id, result.group(1))
+                return int(result.group(1))
 
-            # try name.lower if name doesn't match
-            for converter in (str, str.lower):
-                raw = converter(raw)
+            # name#discriminator, name or nick
+            return raw
 
-                # name#discriminator?
-                if (result := _NAME_REGEX.match(raw)) is not None:
-                    name, discriminator = result.groups()
-                    for member in ctx.guild.members:
-                        if converter(member.username) == name and member.discriminator == discriminator:
-                            return member
+        case _ if hasattr(raw, "__int__"):
+            # maybe a SnowflakeObject was passed
+            return _parse_member(int(raw))
 
-                # name?
-                for member in ctx.guild.members:
-                    if converter(member.username) == raw:
-                        return member
+        case _:
+            return None
 
-                # nick?
-                for member in ctx.guild.members:
-                    if converter(member.nickname) == raw:
-                        return member
 
-        case _ if hasattr(raw, "__int__"):
-            # maybe a SnowflakeObject was passed
-            return await get_member(ctx, int(raw))
+async def get_member(ctx: BaseContext, raw: User | Member | Snowflake_Type) -> Optional[Member]:
+    """
+    Get a member from the context's guild.
+
+    Parameters
+    ----------
+    ctx: BaseContext
+    raw: Member, User, Snowflake_Type
+        The member to find.
+
+    Returns
+    -------
+    Member, optional
+        The found member.
+    """
+    match parsed := _parse_member(raw):
+        case Member():
+            return parsed
+
+        case int():
+            return await _fetch_member(ctx.bot, ctx.guild_id, parsed)
+
+        case str():
+            return _find_member_by_name(ctx, parsed)
 
         case _:
             return None
 
 
+async def get_members(
+    ctx: BaseContext, raws: Iterable[User | Member | Snowflake_Type], *, n: int = 10
+) -> list[Optional[Member]]:
+    """
+    Get multiple members from the context's guild at once.
+
+    Everything which can be answered from the cache is answered from there,
+    the remaining members are fetched with at most ``n`` requests at once.
+
+    Parameters
+    ----------
+    ctx: BaseContext
+    raws: Iterable[Member, User, Snowflake_Type]
+        The members to find (same as for ``get_member``).
+    n: int
+        The maximum amount of simultaneous requests.
+
+    Returns
+    -------
+    list[Member, optional]
+        The found members in the order of ``raws``, ``None`` for every member which couldn't be found.
+    """
+    members: list[Optional[Member]] = []
+    missing: dict[int, list[int]] = {}  # {member id: [positions]}
+
+    for position, raw in enumerate(raws):
+        member: Optional[Member] = None
+        match parsed := _parse_member(raw):
+            case Member():
+                member = parsed
+            case int():
+                if (member := ctx.bot.cache.get_member(ctx.guild_id, parsed)) is None:
+                    missing.setdefault(parsed, []).append(position)
+            case str():
+                member = _find_member_by_name(ctx, parsed)
+        members.append(member)
+
+    async def fetch(member_id: int) -> tuple[int, Optional[Member]]:
+        return member_id, await _fetch_member(ctx.bot, ctx.guild_id, member_id)
+
+    async for member_id, member in semaphore_map(n, fetch, missing):  # type: ignore
+        for position in missing[member_id]:
+            members[position] = member
+
+    return members
+
+
 async def get_user(ctx: BaseContext, raw: User | Member | Snowflake_Type) -> Optional[User]:
     """
     Parameters
@@ -100,7 +490,7 @@ async def get_user(ctx: BaseContext, raw: User | Member | Snowflake_Type) -> Opt
             return raw.user
 
         case _ if _ID_REGEX.match(str(raw)) is not None:  # also covers int() via regex
-            return await ctx.bot.fetch_user(int(raw))
+            return await _fetch_user(ctx.bot, int(raw))
 
         case int():
             # only invalid id's get here
@@ -109,23 +499,10 @@ async def get_user(ctx: BaseContext, raw: User | Member | Snowflake_Type) -> Opt
         case str():
             # mention?
             if (result := _MENTION_REGEX.match(raw)) is not None:
-                return await ctx.bot.fetch_user(result.group(1))
-
-            # try name.lower if name doesn't match
-            for converter in (str, str.lower):
-                raw = converter(raw)
-
-                # name#discriminator?
-                if (result := _NAME_REGEX.match(raw)) is not None:
-                    name, discriminator = result.groups()
-                    for user in ctx.bot.cache.user_cache.values():
-                        if converter(user.username) == name and user.discriminator == discriminator:
-                            return user
-
-                # name?
-                for user in ctx.bot.cache.user_cache.values():
-                    if converter(user.username) == raw:
-                        return user
+                return await _fetch_user(ctx.bot, result.group(1))
+
+            # name#discriminator or name?
+            return _find_user_by_name(ctx, raw)
 
         case _ if hasattr(raw, "__int__"):
             # maybe a SnowflakeObject was passed
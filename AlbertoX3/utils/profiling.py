@@ -0,0 +1,199 @@
+__all__ = (
+    "Phase",
+    "StartupProfiler",
+    "startup_profiler",
+)
+
+
+from contextlib import contextmanager
+from json import dumps
+from pathlib import Path
+from threading import Lock
+from time import perf_counter, process_time
+from typing import Any, Iterator, Optional
+from .essentials import get_logger
+
+
+logger = get_logger()
+
+
+class Phase:
+    """
+    A recorded phase of the startup.
+    """
+
+    __slots__ = ("name", "depth", "start", "wall", "cpu")
+
+    name: str
+    """The name of the phase"""
+    depth: int
+    """The amount of phases this one is nested in"""
+    start: float
+    """The seconds since the profiler got created"""
+    wall: float
+    """The elapsed (wall clock) seconds"""
+    cpu: float
+    """The CPU seconds of the whole process (includes other threads and tasks)"""
+
+    def __init__(self, name: str, depth: int, start: float, wall: float, cpu: float):
+        self.name = name
+        self.depth = depth
+        self.start = start
+        self.wall = wall
+        self.cpu = cpu
+
+    def to_dict(self) -> dict[str, str | int | float]:
+        return {"name": self.name, "depth": self.depth, "start": self.start, "wall": self.wall, "cpu": self.cpu}
+
+
+class StartupProfiler:
+    """
+    Records the wall and CPU time of the startup phases and of every extension import.
+
+    Notes
+    -----
+    Everything recorded after ``finish`` has been called is ignored,
+    so functions which are also used after the startup can be instrumented as well.
+    """
+
+    phases: list[Phase]
+    imports: dict[str, float]
+    finished: bool
+    _wall: float
+    _cpu: float
+    _open: dict[str, tuple[float, float, int]]
+    _lock: Lock
+
+    def __init__(self):
+        self.phases = []
+        self.imports = {}
+        self.finished = False
+        self._wall = perf_counter()
+        self._cpu = process_time()
+        self._open = {}
+        self._lock = Lock()
+
+    def begin(self, name: str) -> None:
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the phase to begin (has to be ended with ``end``).
+        """
+        if self.finished:
+            return
+        with self._lock:
+            self._open[name] = perf_counter(), process_time(), len(self._open)
+
+    def end(self, name: str) -> None:
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the phase to end.
+        """
+        wall, cpu = perf_counter(), process_time()
+        with self._lock:
+            if self.finished or (started := self._open.pop(name, None)) is None:
+                return
+            self.phases.append(
+                Phase(
+                    name=name,
+                    depth=started[2],
+                    start=started[0] - self._wall,
+                    wall=wall - started[0],
+                    cpu=cpu - started[1],
+                )
+            )
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Records the enclosed code as a phase.
+
+        Parameters
+        ----------
+        name: str
+            The name of the phase.
+        """
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    @contextmanager
+    def extension_import(self, name: str) -> Iterator[None]:
+        """
+        Records the import time of an extension.
+
+        Parameters
+        ----------
+        name: str
+            The full name of the extension.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            if not self.finished:
+                self.imports[name] = perf_counter() - start
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns
+        -------
+        dict[str, Any]
+            The recorded phases and imports (JSON serializable).
+        """
+        return {
+            "wall": perf_counter() - self._wall,
+            "cpu": process_time() - self._cpu,
+            "phases": [p.to_dict() for p in sorted(self.phases, key=lambda p: p.start)],
+            "imports": dict(sorted(self.imports.items(), key=lambda i: i[1], reverse=True)),
+        }
+
+    def finish(self, path: Optional[Path] = None) -> Optional[dict[str, Any]]:
+        """
+        Ends the recording, logs a summary and writes the report.
+
+        Parameters
+        ----------
+        path: Path, optional
+            The file to write the report to as JSON.
+
+        Returns
+        -------
+        dict[str, Any], optional
+            The report, ``None`` if the recording was already finished.
+        """
+        if self.finished:
+            return None
+
+        for name in list(self._open):
+            self.end(name)
+        report = self.report()
+        self.finished = True
+
+        lines = [f"Startup took {report['wall']:.3f}s (CPU {report['cpu']:.3f}s)"]
+        for phase in report["phases"]:
+            lines.append(
+                f"{'  ' * (phase['depth'] + 1)}{phase['name']}: {phase['wall']:.3f}s (CPU {phase['cpu']:.3f}s)"
+            )
+        if imports := report["imports"]:
+            lines.append(f"  extension imports: {sum(imports.values()):.3f}s, slowest:")
+            lines.extend(f"    {name}: {wall:.3f}s" for name, wall in list(imports.items())[:5])
+        logger.info("\n".join(lines))
+
+        if path is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(dumps(report, indent=2), "utf-8")
+            except OSError as e:
+                logger.warning(f"Unable to write the startup report to {str(path)!r}: {e!r}")
+
+        return report
+
+
+# global profiler for the startup (starts with the first import of this module)
+startup_profiler: StartupProfiler = StartupProfiler()
@@ -1,49 +1,63 @@
 __all__ = (
     "get_lib_version",
     "get_installed_libraries",
+    "normalize_library_name",
 )
 
 
 import re
 import subprocess  # noqa S404
 
+from functools import cache
+from importlib.metadata import distributions
+from pathlib import Path
+from typing import Optional
 from ..constants import LIB_PATH
+from ..environment import VERSION_OVERRIDE, VERSION_STAMP
 
 
 _VERSION_REGEX: re.Pattern[str] = re.compile(r"^__version__\s*=\s*[\'\"]([^\'\"]*)[\'\"]", re.MULTILINE)
+_LIBRARY_NAME_REGEX: re.Pattern[str] = re.compile(r"[-_.]+")
+_SHA_REGEX: re.Pattern[str] = re.compile(r"^[0-9a-f]{40}$")
+_VERSION_FILE: Path = LIB_PATH.joinpath("VERSION")
+_VERSION_STAMP: Optional[Path] = Path(VERSION_STAMP) if VERSION_STAMP else None
 
 
 def get_lib_version() -> str:
+    """
+    Gets the version of the bot (``__version__+<commit count>+g<short sha>``).
+
+    The version can be overridden at build time with the environment variable ``VERSION_OVERRIDE``
+    or a generated file ``AlbertoX3/VERSION``.
+    The commit sha is read from ``.git`` directly, the commit count is only calculated once per commit
+    (it's stored in the file ``VERSION_STAMP``).
+
+    Returns
+    -------
+    str
+        The version.
+    """
+    if VERSION_OVERRIDE:
+        return VERSION_OVERRIDE
+    if _VERSION_FILE.is_file() and (version := _VERSION_FILE.read_text("utf-8").strip()):
+        return version
+
     file = LIB_PATH.joinpath("__init__.py").read_text("utf-8")
-    version: str
     if (result := _VERSION_REGEX.search(file)) is None:
         version = "0.0.0"
     else:
         version = result.group(1)
 
     try:
-        out: bytes
-        err: bytes
+        if (git_dir := _get_git_dir(LIB_PATH.parent)) is None or (sha := _get_head(git_dir)) is None:
+            return version
 
         # commit count
-        p = subprocess.Popen(  # noqa S603, S607
-            ["git", "rev-list", "--count", "HEAD"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        out, err = p.communicate()
-        if out:
-            version += f"+{out.decode('utf-8').strip()}"
+        if (commit_count := _get_commit_count(git_dir, sha)) is not None:
+            version += f"+{commit_count}"
 
         # commit sha
-        p = subprocess.Popen(  # noqa S603, S607
-            ["git", "rev-parse", "--short", "HEAD"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        out, err = p.communicate()
-        if out:
-            version += f"+g{out.decode('utf-8').strip()}"
+        version += f"+g{sha[:7]}"
 
     except Exception as e:  # noqa: F841  # ToDo: logging
         ...
@@ -51,34 +65,113 @@ def get_lib_version() -> str:
     return version
 
 
-def get_installed_libraries() -> dict[str, str]:
+def _get_git_dir(path: Path) -> Optional[Path]:
+    if (git := path.joinpath(".git")).is_dir():
+        return git
+    if git.is_file():
+        # worktrees and submodules (``gitdir: <path>``)
+        content = git.read_text("utf-8").strip()
+        if content.startswith("gitdir:"):
+            return path.joinpath(content.removeprefix("gitdir:").strip()).resolve()
+    return None
+
+
+def _get_common_dir(git_dir: Path) -> Path:
+    if (common_dir := git_dir.joinpath("commondir")).is_file():
+        return git_dir.joinpath(common_dir.read_text("utf-8").strip()).resolve()
+    return git_dir
+
+
+def _get_head(git_dir: Path) -> Optional[str]:
+    head = git_dir.joinpath("HEAD").read_text("utf-8").strip()
+    if not head.startswith("ref:"):
+        # detached HEAD
+        return head if _SHA_REGEX.match(head) else None
+
+    ref = head.removeprefix("ref:").strip()
+    for directory in (git_dir, _get_common_dir(git_dir)):
+        if (file := directory.joinpath(ref)).is_file():
+            return file.read_text("utf-8").strip()
+
+    if (packed_refs := _get_common_dir(git_dir).joinpath("packed-refs")).is_file():
+        for line in packed_refs.read_text("utf-8").splitlines():
+            if line.startswith(("#", "^")):
+                continue
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                return sha
+
+    return None
+
+
+def _get_commit_count(git_dir: Path, sha: str) -> Optional[str]:
+    stamp = _VERSION_STAMP
+    if stamp is not None and stamp.is_file():
+        stamp_sha, _, commit_count = stamp.read_text("utf-8").partition(" ")
+        if stamp_sha == sha and commit_count.strip():
+            return commit_count.strip()
+
+    out: bytes
+    err: bytes
+    p = subprocess.Popen(  # noqa S603, S607
+        ["git", "rev-list", "--count", sha],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=git_dir,
+    )
+    out, err = p.communicate()
+    if not out:
+        return None
+
+    commit_count = out.decode("utf-8").strip()
+    if stamp is not None:
+        try:
+            stamp.parent.mkdir(parents=True, exist_ok=True)
+            stamp.write_text(f"{sha} {commit_count}", "utf-8")
+        except OSError:
+            # read-only checkouts can't cache the count
+            pass
+    return commit_count
+
+
+def normalize_library_name(name: str) -> str:
     """
-    Gets every installed library via ``pip list``
+    Normalizes the name of a library (PEP 503), e.g. ``Foo_Bar.baz`` becomes ``foo-bar-baz``.
+
+    Parameters
+    ----------
+    name: str
+        The name to normalize.
 
     Returns
     -------
-    dict[str, str]
-        A dictionary with {package: version}.
+    str
+        The normalized name.
     """
-    out: bytes
-    err: bytes
-    p: str
-    v: str
-    libraries: dict[str, str] = {}
+    return _LIBRARY_NAME_REGEX.sub("-", name).lower()
 
-    out, err = subprocess.Popen(  # noqa S603, S607
-        ["pip", "list"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    ).communicate()
 
-    if out:
-        for pkg in out.decode().splitlines(keepends=False):
-            p, v = pkg.split()
-            if p == "Package" and v == "Version":
-                continue
-            if max(len(s.replace("-", "")) for s in [p, v]) == 0:
-                continue
-            libraries[p] = v
+@cache
+def _get_library_index() -> dict[str, str]:
+    libraries: dict[str, str] = {}
+
+    for distribution in distributions():
+        if not (name := distribution.metadata["Name"]):
+            continue
+        # the first one found is the one which gets imported
+        libraries.setdefault(normalize_library_name(name), distribution.version)
 
     return libraries
+
+
+def get_installed_libraries() -> dict[str, str]:
+    """
+    Gets every installed library via ``importlib.metadata``.
+    The libraries are only looked up once and cached for the lifetime of the process.
+
+    Returns
+    -------
+    dict[str, str]
+        A dictionary with {package: version}, the package names are normalized (see ``normalize_library_name``).
+    """
+    return _get_library_index().copy()
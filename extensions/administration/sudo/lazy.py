@@ -0,0 +1,7 @@
+__all__ = ("COMMANDS",)
+
+
+# the commands of this extension (name: aliases), it's only loaded on first use of one of them
+COMMANDS: dict[str, list[str]] = {
+    "sudo": ["!!"],
+}
@@ -11,7 +11,7 @@ logger = get_logger()
 
 
 class Language(Extension):
-    # ToDo: set (change language for bot responses)
+    # ToDo: set (change language for bot responses) and call ``invalidate_language`` afterwards
     pass
 
 
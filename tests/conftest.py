@@ -0,0 +1,7 @@
+from os import environ
+
+
+# the environment is read on import, the bot doesn't need to (and can't) connect for the tests
+environ.setdefault("TOKEN", "test")
+environ.setdefault("TRANSLATIONS_CACHE", "")
+environ.setdefault("EXTENSIONS_MANIFEST", "")
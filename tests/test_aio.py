@@ -0,0 +1,307 @@
+from asyncio import CancelledError, Event, all_tasks, create_task, current_task, gather, run, sleep
+from typing import AsyncIterator, Iterable
+from pytest import raises
+from AlbertoX3.aio import KeyLockDeco, SingleFlightDeco, semaphore_map
+from AlbertoX3.errors import TaskCancelledError
+
+
+async def _yield(times: int = 5) -> None:
+    for _ in range(times):
+        await sleep(0)
+
+
+def test_key_lock_serializes_same_key():
+    active: list[str] = []
+    overlaps: list[str] = []
+
+    @KeyLockDeco.by(lambda key: key)
+    async def locked(key: str) -> str:
+        if key in active:
+            overlaps.append(key)
+        active.append(key)
+        await _yield()
+        active.remove(key)
+        return key
+
+    async def main() -> list[str]:
+        return await gather(locked("a"), locked("a"), locked("a"))
+
+    assert run(main()) == ["a", "a", "a"]
+    assert overlaps == []
+    assert locked._locks == {}
+
+
+def test_key_lock_runs_different_keys_in_parallel():
+    started = Event()
+
+    @KeyLockDeco.by(lambda key: key)
+    async def locked(key: str) -> str:
+        if key == "a":
+            # would dead-lock if "b" had to wait for "a"
+            await started.wait()
+        else:
+            started.set()
+        return key
+
+    async def main() -> list[str]:
+        return await gather(locked("a"), locked("b"))
+
+    assert run(main()) == ["a", "b"]
+    assert locked._locks == {}
+
+
+def test_key_lock_releases_on_exception():
+    @KeyLockDeco
+    async def locked(value: int) -> int:
+        raise ValueError(value)
+
+    async def main() -> None:
+        with raises(ValueError):
+            await locked(1)
+        with raises(ValueError):
+            await locked(1)
+
+    run(main())
+    assert locked._locks == {}
+
+
+def test_single_flight_coalesces_calls():
+    calls: list[str] = []
+
+    @SingleFlightDeco.by(lambda key: key)
+    async def fetch(key: str) -> str:
+        calls.append(key)
+        await _yield()
+        return key.upper()
+
+    async def main() -> list[str]:
+        return await gather(fetch("a"), fetch("a"), fetch("b"), fetch("a"))
+
+    assert run(main()) == ["A", "A", "B", "A"]
+    assert calls == ["a", "b"]
+    assert fetch._pending == {}
+
+
+def test_single_flight_runs_again_after_finishing():
+    calls: list[int] = []
+
+    @SingleFlightDeco
+    async def fetch() -> int:
+        calls.append(len(calls))
+        return len(calls)
+
+    async def main() -> list[int]:
+        return [await fetch(), await fetch()]
+
+    assert run(main()) == [1, 2]
+
+
+def test_single_flight_shares_exceptions():
+    calls: list[None] = []
+
+    @SingleFlightDeco
+    async def fetch() -> None:
+        calls.append(None)
+        await _yield()
+        raise ValueError("failed")
+
+    async def main() -> list[BaseException]:
+        return await gather(fetch(), fetch(), return_exceptions=True)
+
+    results = run(main())
+    assert len(calls) == 1
+    assert [type(e) for e in results] == [ValueError, ValueError]
+    assert fetch._pending == {}
+
+
+def test_single_flight_cancelled_first_caller_does_not_cancel_waiters():
+    release = Event()
+
+    @SingleFlightDeco
+    async def fetch() -> str:
+        await release.wait()
+        return "result"
+
+    async def main() -> None:
+        first = create_task(fetch())
+        await _yield()
+        waiter = create_task(fetch())
+        await _yield()
+
+        first.cancel()
+        await _yield()
+        release.set()
+
+        assert await waiter == "result"
+        with raises(CancelledError):
+            await first
+
+    run(main())
+    assert fetch._pending == {}
+
+
+def test_single_flight_cancelled_waiter_does_not_cancel_others():
+    release = Event()
+
+    @SingleFlightDeco
+    async def fetch() -> str:
+        await release.wait()
+        return "result"
+
+    async def main() -> None:
+        first = create_task(fetch())
+        await _yield()
+        waiter = create_task(fetch())
+        await _yield()
+
+        waiter.cancel()
+        await _yield()
+        release.set()
+
+        assert await first == "result"
+        with raises(CancelledError):
+            await waiter
+
+    run(main())
+    assert fetch._pending == {}
+
+
+def test_single_flight_cancels_execution_without_callers():
+    cancelled = Event()
+
+    @SingleFlightDeco
+    async def fetch() -> None:
+        try:
+            await Event().wait()
+        except CancelledError:
+            cancelled.set()
+            raise
+
+    async def main() -> None:
+        first = create_task(fetch())
+        await _yield()
+        first.cancel()
+        await _yield()
+
+        assert cancelled.is_set()
+        assert fetch._pending == {}
+
+    run(main())
+
+
+async def _delayed(item: int) -> int:
+    # the higher the item, the earlier it's done
+    await _yield((10 - item) * 10)
+    return item
+
+
+async def _collect(n: int, items: Iterable[int] | AsyncIterator[int], **kwargs: bool) -> list[int | BaseException]:
+    return [result async for result in semaphore_map(n, _delayed, items, **kwargs)]
+
+
+def test_semaphore_map_unordered():
+    assert run(_collect(3, [1, 2, 3])) == [3, 2, 1]
+
+
+def test_semaphore_map_ordered():
+    assert run(_collect(3, [1, 2, 3], ordered=True)) == [1, 2, 3]
+    assert run(_collect(2, range(10), ordered=True)) == list(range(10))
+
+
+def test_semaphore_map_limits_running_tasks():
+    running: list[int] = []
+    maximum: list[int] = [0]
+
+    async def func(item: int) -> int:
+        running.append(item)
+        maximum[0] = max(maximum[0], len(running))
+        await _yield()
+        running.remove(item)
+        return item
+
+    async def main() -> list[int]:
+        return [result async for result in semaphore_map(3, func, range(10))]  # type: ignore
+
+    assert sorted(run(main())) == list(range(10))  # type: ignore
+    assert maximum[0] == 3
+
+
+def test_semaphore_map_async_items():
+    async def items() -> AsyncIterator[int]:
+        for i in range(5):
+            await sleep(0)
+            yield i
+
+    assert run(_collect(2, items(), ordered=True)) == [0, 1, 2, 3, 4]
+
+
+def test_semaphore_map_exceptions():
+    async def func(item: int) -> int:
+        await _yield(item)
+        if item == 1:
+            raise ValueError(item)
+        return item
+
+    async def main(return_exceptions: bool) -> list[int | BaseException]:
+        return [
+            result
+            async for result in semaphore_map(3, func, range(3), ordered=True, return_exceptions=return_exceptions)
+        ]
+
+    results = run(main(True))
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], ValueError)
+
+    with raises(ValueError):
+        run(main(False))
+
+
+def test_semaphore_map_cancelled_task():
+    async def func(item: int) -> int:
+        if item == 1:
+            current_task().cancel()  # type: ignore
+        await sleep(0)
+        return item
+
+    async def main(return_exceptions: bool) -> list[int | BaseException]:
+        return [
+            result
+            async for result in semaphore_map(3, func, range(3), ordered=True, return_exceptions=return_exceptions)
+        ]
+
+    results = run(main(True))
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], TaskCancelledError) and results[1].idx == 1
+
+    with raises(TaskCancelledError):
+        run(main(False))
+
+
+def test_semaphore_map_break_cancels_pending_tasks():
+    cancelled: list[int] = []
+
+    async def func(item: int) -> int:
+        try:
+            await _yield(item * 2)
+        except CancelledError:
+            cancelled.append(item)
+            raise
+        return item
+
+    async def main() -> None:
+        generator = semaphore_map(3, func, range(10))
+        async for result in generator:
+            assert result == 0
+            break
+        await generator.aclose()  # type: ignore
+
+        # the task of item 3 got cancelled before it even started
+        assert sorted(cancelled) == [1, 2]
+        assert all_tasks() == {current_task()}
+
+    run(main())
+
+
+def test_semaphore_map_invalid_n():
+    with raises(ValueError):
+        run(_collect(0, [1]))
@@ -0,0 +1,181 @@
+from asyncio import Queue, create_task, run, sleep, wait_for
+from typing import Any, AsyncIterator, Optional
+from pytest import MonkeyPatch
+from AlbertoX3 import cache
+from AlbertoX3.cache import CacheInvalidator, LocalCache
+from AlbertoX3.constants import MISSING
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.messages: Queue[Optional[dict[str, Any]]] = Queue()
+        self.closed = False
+
+    async def subscribe(self, channel: str) -> None:
+        if self.redis.failures:
+            self.redis.failures -= 1
+            raise ConnectionError("unable to connect")
+        self.redis.subscribers.setdefault(channel, []).append(self)
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        yield {"type": "subscribe", "data": 1}
+        while (message := await self.messages.get()) is not None:
+            yield message
+        raise ConnectionError("connection lost")
+
+    async def unsubscribe(self, channel: str) -> None:
+        if self in (subscribers := self.redis.subscribers.get(channel, [])):
+            subscribers.remove(self)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeRedis:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.subscribers: dict[str, list[FakePubSub]] = {}
+        self.published: list[tuple[str, str]] = []
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.published.append((channel, message))
+        for subscriber in self.subscribers.get(channel, []):
+            subscriber.messages.put_nowait({"type": "message", "data": message.encode()})
+
+    def disconnect(self, channel: str) -> None:
+        for subscriber in self.subscribers.get(channel, []):
+            subscriber.messages.put_nowait(None)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_local_cache_expires_entries(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(cache, "monotonic", clock := Clock())
+    local = LocalCache(maxsize=10, ttl=5)
+
+    local.set("key", "value")
+    clock.now = 4.9
+    assert local.get("key") == "value"
+    clock.now = 5.1
+    assert local.get("key") is MISSING
+    assert local.get("key", None) is None
+    assert len(local) == 0
+
+
+def test_local_cache_drops_least_recently_used():
+    local = LocalCache(maxsize=2, ttl=60)
+
+    local.set("a", 1)
+    local.set("b", 2)
+    assert local.get("a") == 1  # "b" is the least recently used one now
+    local.set("c", 3)
+
+    assert "a" in local
+    assert "b" not in local
+    assert "c" in local
+    assert len(local) == 2
+
+
+def test_local_cache_generation_guard():
+    local = LocalCache(maxsize=10, ttl=60)
+
+    generation = local.generation
+    local.invalidate("key")  # e.g. changed while the value was fetched
+    local.set("key", "stale", generation)
+    assert local.get("key") is MISSING
+
+    local.set("key", "fresh", local.generation)
+    assert local.get("key") == "fresh"
+
+
+def test_local_cache_invalidation_hooks():
+    local = LocalCache(maxsize=10, ttl=60)
+    invalidated: list[str] = []
+    local.add_invalidation_hook(invalidated.append)
+
+    local.set("key", "value")
+    local.invalidate("key")
+
+    assert local.get("key") is MISSING
+    assert invalidated == ["key"]
+
+
+def test_local_cache_inactive():
+    local = LocalCache(maxsize=10, ttl=60)
+    local.set("key", "value")
+
+    local.active = False
+    assert local.get("key") is MISSING
+    local.set("other", "value")
+
+    local.active = True
+    assert local.get("key") == "value"
+    assert local.get("other") is MISSING
+
+
+def test_invalidator_is_inactive_until_listening():
+    local = LocalCache(maxsize=10, ttl=60)
+    invalidator = CacheInvalidator(FakeRedis(), "channel", local)  # type: ignore
+
+    local.set("key", "value")
+    assert not invalidator.listening.is_set()
+    assert local.get("key") is MISSING
+
+
+def test_invalidator_invalidates_every_process():
+    redis = FakeRedis()
+    local, other = LocalCache(maxsize=10, ttl=60), LocalCache(maxsize=10, ttl=60)
+    invalidator = CacheInvalidator(redis, "channel", local)  # type: ignore
+    other_invalidator = CacheInvalidator(redis, "channel", other)  # type: ignore
+
+    async def main() -> None:
+        listener = create_task(other_invalidator.listen())
+        await wait_for(other_invalidator.listening.wait(), 1)
+        other.set("key", "value")
+
+        await invalidator.invalidate("key")
+        await sleep(0)
+        assert redis.published == [("channel", "key")]
+        assert other.get("key") is MISSING
+
+        listener.cancel()
+
+    run(main())
+
+
+def test_invalidator_reconnects():
+    redis = FakeRedis(failures=2)
+    local = LocalCache(maxsize=10, ttl=60)
+    invalidator = CacheInvalidator(redis, "channel", local)  # type: ignore
+
+    async def main() -> None:
+        listener = create_task(invalidator.listen(retry_delay=0.01))
+        await wait_for(invalidator.listening.wait(), 1)
+        assert redis.failures == 0
+        local.set("key", "value")
+
+        # missed invalidations can't be known, so nothing cached before may be used after reconnecting
+        redis.disconnect("channel")
+        await sleep(0)
+        assert not invalidator.listening.is_set()
+        assert local.get("key") is MISSING
+
+        await wait_for(invalidator.listening.wait(), 1)
+        assert local.get("key") is MISSING
+        local.set("key", "value")
+        assert local.get("key") == "value"
+
+        listener.cancel()
+
+    run(main())
+    assert not invalidator.listening.is_set()
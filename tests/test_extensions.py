@@ -0,0 +1,69 @@
+from pathlib import Path
+from pytest import MonkeyPatch, fixture
+from AlbertoX3.misc import PrimitiveExtension
+from AlbertoX3.utils.extensions import check_extension_requirements, get_extensions
+
+
+class Folder:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def add(self, full_name: str, *requires: str, enabled: bool = True, lib: tuple[str, ...] = ()) -> None:
+        group, name = full_name.split(".")
+        (ext := self.path.joinpath(group, name)).mkdir(parents=True)
+        self.path.joinpath(group, "__init__.py").touch()
+        ext.joinpath("__init__.py").touch()
+        ext.joinpath("ext.py").write_text(
+            "from AlbertoX3.ipy_wrapper import Extension\n"
+            "class Ext(Extension):\n"
+            f"    enabled = {enabled}\n"
+            f"    requires = {{'lib': {list(lib)!r}, 'ext': {list(requires)!r}}}\n"
+            "def setup(bot): Ext(bot=bot)\n"
+        )
+
+    def check(self) -> list[str]:
+        extensions: set[PrimitiveExtension] = get_extensions(self.path)
+        return [ext.full_name for ext in check_extension_requirements(extensions)]
+
+
+@fixture
+def folder(tmp_path: Path, monkeypatch: MonkeyPatch) -> Folder:
+    # the extensions are imported as ``<folder>.<group>.<name>``, every test needs its own package
+    (path := tmp_path.joinpath(f"extensions_{tmp_path.name}")).mkdir()
+    path.joinpath("__init__.py").touch()
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return Folder(path)
+
+
+def test_dependencies_are_loaded_first(folder: Folder):
+    folder.add("a.top", "b.middle", "c.bottom")
+    folder.add("b.middle", "c.bottom")
+    folder.add("c.bottom")
+    folder.add("d.alone")
+
+    order = folder.check()
+    assert sorted(order) == ["a.top", "b.middle", "c.bottom", "d.alone"]
+    assert order.index("c.bottom") < order.index("b.middle") < order.index("a.top")
+
+
+def test_dependents_of_disabled_extensions(folder: Folder):
+    folder.add("a.disabled", enabled=False)
+    folder.add("a.direct", "a.disabled")
+    folder.add("a.indirect", "a.direct")
+    folder.add("b.missing", "b.nowhere")
+    folder.add("b.library", lib=("a-library-which-does-not-exist",))
+    folder.add("b.fine")
+
+    assert folder.check() == ["b.fine"]
+
+
+def test_cycles_are_not_loaded(folder: Folder):
+    folder.add("a.one", "a.two")
+    folder.add("a.two", "a.three")
+    folder.add("a.three", "a.one")
+    folder.add("b.self", "b.self")
+    folder.add("c.dependent", "a.one")
+    folder.add("c.fine", "c.base")
+    folder.add("c.base")
+
+    assert folder.check() == ["c.base", "c.fine"]
@@ -0,0 +1,67 @@
+from asyncio import Event
+from types import SimpleNamespace
+from typing import Any, Optional
+from pytest import MonkeyPatch, fixture, mark
+from AlbertoX3.utils import ipy
+from AlbertoX3.utils.ipy import _MemberNameIndex, _find_member_by_name, _scan_members_by_name
+
+
+def _member(member_id: int, username: str, discriminator: str, nickname: Optional[str] = None) -> Any:
+    return SimpleNamespace(id=member_id, username=username, discriminator=discriminator, nickname=nickname)
+
+
+_MEMBERS = [
+    _member(1, "Alice", "0001", "Bob"),
+    _member(2, "alice", "0002"),
+    _member(3, "bob", "0003", "Alice#0002"),
+    _member(4, "Carol", "0004", "carol"),
+    _member(5, "Dave", "0005", "CAROL"),
+    _member(6, "Eve", "0006", "Straße"),
+    _member(7, "ALICE", "0001"),
+]
+
+
+@fixture
+def ctx(monkeypatch: MonkeyPatch) -> Any:
+    monkeypatch.setattr(ipy, "_member_name_index", index := _MemberNameIndex())
+    index.active = True
+
+    chunked = Event()
+    chunked.set()
+    members = {member.id: member for member in _MEMBERS}
+    guild = SimpleNamespace(id=42, members=_MEMBERS, chunked=chunked)
+    cache = SimpleNamespace(get_member=lambda guild_id, member_id: members.get(member_id))
+    return SimpleNamespace(guild=guild, guild_id=guild.id, bot=SimpleNamespace(cache=cache))
+
+
+@mark.parametrize(
+    "raw, expected",
+    [
+        ("Alice", 1),  # exact username before the lower case ones
+        ("alice", 2),
+        ("ALICE", 7),
+        ("aLiCe", 1),  # the first one matching in lower case
+        ("Bob", 1),  # exact nickname before the lower case username
+        ("bob", 3),
+        ("BOB", 3),  # lower case username before the lower case nickname
+        ("Alice#0001", 1),
+        ("ALICE#0001", 7),
+        ("alice#0001", 1),
+        ("Alice#0002", 3),  # exact nickname looking like a tag before the lower case tag of 2
+        ("alice#0002", 2),
+        ("carol", 4),  # exact nickname
+        ("CAROL", 5),
+        ("Carol", 4),
+        ("straße", 6),
+        ("STRASSE", None),  # only case-folded, not lower case
+        ("Eve#0001", None),
+        ("nobody", None),
+        ("", None),
+    ],
+)
+def test_member_index_matches_scan(ctx: Any, raw: str, expected: Optional[int]):
+    scanned = _scan_members_by_name(ctx, raw)
+    found = _find_member_by_name(ctx, raw)
+
+    assert ipy._member_name_index._guilds  # the index got used
+    assert (scanned and scanned.id) == (found and found.id) == expected
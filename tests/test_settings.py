@@ -0,0 +1,90 @@
+from asyncio import CancelledError, Event, create_task, run, sleep
+from typing import Any, Optional
+from pytest import MonkeyPatch, raises
+from AlbertoX3 import database, settings
+from AlbertoX3.database import db_context
+from AlbertoX3.settings import SettingsModel
+
+
+class FakeResult:
+    def scalar(self) -> None:
+        return None
+
+
+class FakeSession:
+    sessions: list["FakeSession"] = []
+    release: Event
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self.querying = False
+        self.closed = False
+        self.added: list[Any] = []
+        self.committed: list[Any] = []
+        self.errors: list[str] = []
+        FakeSession.sessions.append(self)
+
+    async def execute(self, statement: Any) -> FakeResult:
+        self.querying = True
+        await FakeSession.release.wait()
+        self.querying = False
+        if self.closed:
+            self.errors.append("query on a closed session")
+        return FakeResult()
+
+    def add(self, obj: Any) -> None:
+        self.added.append(obj)
+
+    async def commit(self) -> None:
+        if self.querying:
+            self.errors.append("commit while a query is running")
+        self.committed.extend(self.added)
+        self.added.clear()
+
+    async def close(self) -> None:
+        if self.querying:
+            self.errors.append("close while a query is running")
+        self.closed = True
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data: dict[str, Any] = {}
+
+    async def execute_command(self, command: str, key: str, *args: Any) -> Optional[Any]:
+        if command == "GET":
+            return self.data.get(key)
+        self.data[key] = args[-1]
+        return None
+
+
+def test_fetch_uses_its_own_session(monkeypatch: MonkeyPatch):
+    FakeSession.sessions = []
+    monkeypatch.setattr(database, "AsyncSession", FakeSession)
+    monkeypatch.setattr(settings, "redis", redis := FakeRedis())
+
+    async def caller() -> Any:
+        async with db_context():
+            return await SettingsModel.get(str, "key", "default")
+
+    async def main() -> None:
+        FakeSession.release = Event()
+        first = create_task(caller())
+        await sleep(0.01)
+        waiter = create_task(caller())
+        await sleep(0.01)
+
+        # the first caller finishes (and closes its session) while the shared query is still running
+        first.cancel()
+        with raises(CancelledError):
+            await first
+        FakeSession.release.set()
+
+        assert await waiter == "default"
+
+    run(main())
+
+    assert redis.data == {"settings:key": "default"}
+    assert [session.errors for session in FakeSession.sessions] == [[]]
+    [session] = FakeSession.sessions
+    assert session.closed
+    assert [(row.key, row.value) for row in session.committed] == [("key", "default")]